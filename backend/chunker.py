@@ -0,0 +1,114 @@
+from functools import lru_cache
+from typing import List
+
+try:
+    import tiktoken
+except ImportError:  # Fall back to a character estimate if tiktoken is missing
+    tiktoken = None
+
+# Rough characters-per-token ratio for English text, used without tiktoken
+CHARS_PER_TOKEN = 4
+
+# Split points for oversized posts, from coarsest to finest: the comments
+# block, individual comments, paragraphs, lines, sentences and words
+SPLIT_SEPARATORS = ["\n\n--- COMMENTS ---\n", "\nComment by ", "\n\n", "\n", ". ", " "]
+
+CHUNK_SEPARATOR = "\n\n"
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str):
+    """Get the tiktoken encoding for a model, or None if it cannot be loaded"""
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # Encodings are downloaded on first use, which fails offline
+        print(f"Could not load tiktoken encoding for {model}, estimating tokens: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4") -> int:
+    """Count the tokens text uses for the given model"""
+    encoding = get_encoding(model)
+    if encoding is None:
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _hard_split(text: str, max_tokens: int, model: str) -> List[str]:
+    """Split text into pieces of at most max_tokens regardless of boundaries"""
+    encoding = get_encoding(model)
+    if encoding is None:
+        step = max_tokens * CHARS_PER_TOKEN
+        return [text[i:i + step] for i in range(0, len(text), step)]
+    tokens = encoding.encode(text, disallowed_special=())
+    return [encoding.decode(tokens[i:i + max_tokens]) for i in range(0, len(tokens), max_tokens)]
+
+
+def split_oversized(text: str, max_tokens: int, model: str = "gpt-4", separators: List[str] = SPLIT_SEPARATORS) -> List[str]:
+    """Split text into segments of at most max_tokens on the coarsest boundaries that work.
+
+    Each separator stays attached to the piece that follows it, so comment
+    headers and paragraph breaks are kept with their content.
+    """
+    if count_tokens(text, model) <= max_tokens:
+        return [text]
+    if not separators:
+        return _hard_split(text, max_tokens, model)
+
+    separator, finer = separators[0], separators[1:]
+    pieces = text.split(separator)
+    pieces = [pieces[0]] + [separator + piece for piece in pieces[1:]]
+
+    segments = []
+    current = ""
+    current_tokens = 0
+    for piece in pieces:
+        if not piece:
+            continue
+        piece_tokens = count_tokens(piece, model)
+        if piece_tokens > max_tokens:
+            if current:
+                segments.append(current)
+                current, current_tokens = "", 0
+            segments.extend(split_oversized(piece, max_tokens, model, finer))
+        elif current_tokens + piece_tokens > max_tokens:
+            segments.append(current)
+            current, current_tokens = piece, piece_tokens
+        else:
+            current += piece
+            current_tokens += piece_tokens
+    if current:
+        segments.append(current)
+    return [segment for segment in segments if segment.strip()]
+
+
+def chunk_contents(contents: List[str], target_tokens: int, model: str = "gpt-4") -> List[str]:
+    """Pack posts into chunks of at most target_tokens using real token counts.
+
+    Posts larger than the target are split with split_oversized. Pieces are
+    placed first-fit, so later small posts fill the space left in earlier
+    chunks and each chunk ends up close to the budget.
+    """
+    separator_tokens = count_tokens(CHUNK_SEPARATOR, model)
+    chunks: List[List[str]] = []
+    chunk_tokens: List[int] = []
+
+    for content in contents:
+        for segment in split_oversized(content, target_tokens, model):
+            segment_tokens = count_tokens(segment, model)
+            for i, used in enumerate(chunk_tokens):
+                if used + separator_tokens + segment_tokens <= target_tokens:
+                    chunks[i].append(segment)
+                    chunk_tokens[i] = used + separator_tokens + segment_tokens
+                    break
+            else:
+                chunks.append([segment])
+                chunk_tokens.append(segment_tokens)
+
+    return [CHUNK_SEPARATOR.join(chunk) for chunk in chunks]
@@ -0,0 +1,93 @@
+import contextvars
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from cache import make_cache_key
+
+# Client set selected for the current request (None = the default set)
+current_client_key: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_client_key", default=None)
+
+
+class ClientSet:
+    """OpenAI and Reddit clients built from one set of credentials"""
+
+    def __init__(self, async_openai_client: Any = None, reddit_client: Any = None):
+        self.async_openai_client = async_openai_client
+        self.reddit_client = reddit_client
+
+
+def credential_key(config: Dict[str, str]) -> str:
+    """Stable key for a credential set; the credentials themselves are not stored in it"""
+    return make_cache_key(
+        config.get("openai_api_key"),
+        config.get("reddit_client_id"),
+        config.get("reddit_client_secret"),
+        config.get("reddit_user_agent"),
+    )[:32]
+
+
+class ClientRegistry:
+    """Reuses API clients per credential set, least recently used first out.
+
+    Configuring the same credentials again returns the existing clients (and
+    their warm connection pools) instead of building new ones. Requests pick
+    a client set through `current_client_key`; without one they get the
+    default set.
+    """
+
+    def __init__(self, build: Callable[[Dict[str, str]], ClientSet], max_clients: int = 32):
+        self.build = build
+        self.max_clients = max(1, max_clients)
+        self.default = ClientSet()
+        self._clients: "OrderedDict[str, ClientSet]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+    def get_or_create(self, config: Dict[str, str]) -> Tuple[str, ClientSet, bool]:
+        """Return (key, clients, created) for a credential set"""
+        key = credential_key(config)
+        with self._lock:
+            clients = self._clients.get(key)
+            if clients is not None:
+                self._clients.move_to_end(key)
+                self.reused += 1
+                return key, clients, False
+        # Build outside the lock; client construction can do network I/O
+        clients = self.build(config)
+        with self._lock:
+            existing = self._clients.get(key)
+            if existing is not None:
+                return key, existing, False
+            self._clients[key] = clients
+            self.created += 1
+            # Evicted clients are not closed here since requests may still be
+            # using them; their pools are released once they are unreferenced
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+                self.evicted += 1
+        return key, clients, True
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._clients
+
+    def current(self) -> ClientSet:
+        """Client set for the current request"""
+        key = current_client_key.get()
+        if key is None:
+            return self.default
+        with self._lock:
+            return self._clients.get(key) or ClientSet()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "clientSets": len(self._clients),
+                "maxClientSets": self.max_clients,
+                "created": self.created,
+                "reused": self.reused,
+                "evicted": self.evicted,
+            }
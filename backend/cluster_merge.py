@@ -0,0 +1,141 @@
+import re
+from typing import Dict, List
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "into", "is", "it",
+    "lack", "of", "on", "or", "the", "to", "too", "with", "without", "difficulty", "issue",
+    "issues", "problem", "problems", "struggle", "struggles", "struggling",
+}
+
+SUFFIXES = ("ations", "ation", "ments", "ment", "ings", "ing", "ities", "ity", "ies", "ers", "er", "es", "ed", "ly", "s")
+
+# Feature weights: cluster names dominate, themes and character n-grams refine
+NAME_WEIGHT = 1.0
+NGRAM_WEIGHT = 0.5
+THEME_WEIGHT = 0.5
+
+
+def stem(word: str) -> str:
+    """Strip common English suffixes so "managing" and "management" compare equal"""
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            break
+    if word.endswith("e") and len(word) > 3:
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    return [stem(token) for token in TOKEN_PATTERN.findall(str(text).lower()) if token not in STOPWORDS]
+
+
+def _features(cluster: Dict) -> Dict[str, float]:
+    features: Dict[str, float] = {}
+    for token in tokenize(cluster.get("name", "")):
+        features["w:" + token] = features.get("w:" + token, 0.0) + NAME_WEIGHT
+        padded = f" {token} "
+        for i in range(len(padded) - 2):
+            gram = "g:" + padded[i:i + 3]
+            features[gram] = features.get(gram, 0.0) + NGRAM_WEIGHT
+    for theme in cluster.get("themes") or []:
+        for token in tokenize(theme):
+            features["w:" + token] = features.get("w:" + token, 0.0) + THEME_WEIGHT
+    return features
+
+
+def similarity_matrix(clusters: List[Dict]) -> np.ndarray:
+    """Pairwise cosine similarity of clusters over IDF-weighted name/theme features"""
+    feature_maps = [_features(cluster) for cluster in clusters]
+    vocabulary: Dict[str, int] = {}
+    for features in feature_maps:
+        for feature in features:
+            vocabulary.setdefault(feature, len(vocabulary))
+    matrix = np.zeros((len(clusters), max(len(vocabulary), 1)))
+    for row, features in enumerate(feature_maps):
+        for feature, weight in features.items():
+            matrix[row, vocabulary[feature]] = weight
+
+    document_frequency = np.count_nonzero(matrix, axis=0)
+    idf = np.log((1 + len(clusters)) / (1 + document_frequency)) + 1.0
+    matrix *= idf
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+    return matrix @ matrix.T
+
+
+def _number(value, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _unique(items: List, key=lambda item: str(item).strip().lower()) -> List:
+    seen = set()
+    unique_items = []
+    for item in items:
+        item_key = key(item)
+        if item_key and item_key not in seen:
+            seen.add(item_key)
+            unique_items.append(item)
+    return unique_items
+
+
+def _combine(group: List[Dict]) -> Dict:
+    """Combine similar clusters into one, weighting averages by frequency"""
+    if len(group) == 1:
+        return group[0]
+    frequencies = np.array([max(_number(cluster.get("frequency"), 1.0), 1.0) for cluster in group])
+    intensities = np.array([_number(cluster.get("emotionIntensity")) for cluster in group])
+    gaps = np.array([_number(cluster.get("solutionGap")) for cluster in group])
+    representative = group[int(np.argmax(frequencies))]
+
+    merged = dict(representative)
+    merged["themes"] = _unique([theme for cluster in group for theme in cluster.get("themes") or []])
+    merged["quotes"] = _unique([quote for cluster in group for quote in cluster.get("quotes") or []])
+    merged["painPoints"] = _unique(
+        [point for cluster in group for point in cluster.get("painPoints") or []],
+        key=lambda point: str(point.get("point", "") if isinstance(point, dict) else point).strip().lower(),
+    )
+    merged["frequency"] = int(sum(_number(cluster.get("frequency")) for cluster in group))
+    merged["emotionIntensity"] = round(float(np.average(intensities, weights=frequencies)), 1)
+    merged["solutionGap"] = round(float(np.average(gaps, weights=frequencies)), 1)
+    return merged
+
+
+def merge_clusters(clusters: List[Dict], threshold: float = 0.6) -> List[Dict]:
+    """Deduplicate pain-point clusters whose names/themes are similar.
+
+    Clusters with cosine similarity >= threshold are grouped transitively
+    and combined: quotes, themes and pain points are unioned, frequencies
+    summed and intensity/gap averaged by frequency. Groups keep the order
+    of their first cluster.
+    """
+    clusters = [cluster for cluster in clusters if isinstance(cluster, dict)]
+    if len(clusters) < 2:
+        return clusters
+
+    similarity = similarity_matrix(clusters)
+    parent = list(range(len(clusters)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    rows, cols = np.nonzero(np.triu(similarity >= threshold, k=1))
+    for i, j in zip(rows.tolist(), cols.tolist()):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    groups: Dict[int, List[Dict]] = {}
+    for i, cluster in enumerate(clusters):
+        groups.setdefault(find(i), []).append(cluster)
+    return [_combine(group) for group in groups.values()]
@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+
+class PostCollector:
+    """Collects posts in insertion order, deduplicated by submission ID.
+
+    Membership checks are O(1) dict lookups.
+    """
+
+    def __init__(self):
+        self._posts: Dict[str, Any] = {}
+
+    def add(self, submission_id: str, post: Any) -> bool:
+        """Add a post unless its ID was already collected; returns True if added"""
+        if submission_id in self._posts:
+            return False
+        self._posts[submission_id] = post
+        return True
+
+    def __contains__(self, submission_id: str) -> bool:
+        return submission_id in self._posts
+
+    def __len__(self) -> int:
+        return len(self._posts)
+
+    def posts(self) -> List[Any]:
+        return list(self._posts.values())
+
+
+class SessionRegistry:
+    """Remembers which submission IDs each client session has already been sent.
+
+    Sessions expire after `ttl` seconds of inactivity and the least recently
+    used sessions are dropped beyond `max_sessions`.
+    """
+
+    def __init__(self, max_sessions: int = 1000, ttl: float = 3600):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, session_id: str) -> Set[str]:
+        now = time.time()
+        entry = self._sessions.get(session_id)
+        if entry is None or entry[0] + self.ttl <= now:
+            seen: Set[str] = set()
+        else:
+            seen = entry[1]
+        self._sessions[session_id] = (now, seen)
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return seen
+
+    def filter_new(self, session_id: Optional[str], posts: Iterable[Dict]) -> List[Dict]:
+        """Drop posts the session has already seen and remember the rest"""
+        posts = list(posts)
+        if not session_id:
+            return posts
+        with self._lock:
+            seen = self._get(session_id)
+            new_posts = []
+            for post in posts:
+                post_id = post.get("id")
+                if post_id is None:
+                    new_posts.append(post)
+                elif post_id not in seen:
+                    seen.add(post_id)
+                    new_posts.append(post)
+            return new_posts
@@ -0,0 +1,56 @@
+import heapq
+import itertools
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def top_comments(forest: Iterable[Any], k: int = 10, min_length: int = 10,
+                 max_depth: Optional[int] = None, max_visited: Optional[int] = None) -> List[Dict]:
+    """Highest-scored comments of a comment tree, best first.
+
+    Walks the tree breadth first with one iterator per reply list instead of
+    flattening it, so max_visited is spent on top-level comments before any
+    replies, and keeps only the best k comments in a min-heap. Comments whose
+    body is no longer than min_length characters are skipped. max_depth
+    (0 = top-level only) stops the walk at that depth, and max_visited caps
+    the number of comments examined.
+    "Load more comments" placeholders have no body and are skipped.
+    """
+    if k <= 0:
+        return []
+    heap: list = []
+    counter = itertools.count()
+    queue = deque([(0, iter(forest))])
+    visited = 0
+    while queue:
+        depth, level = queue[0]
+        comment = next(level, None)
+        if comment is None:
+            queue.popleft()
+            continue
+        body = getattr(comment, "body", None)
+        if body is None:
+            continue
+        visited += 1
+        if len(body.strip()) > min_length:
+            order = next(counter)
+            # Ties keep the comment reached first (Reddit's own ordering)
+            entry = (comment.score, -order, comment)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+        if max_visited is not None and visited >= max_visited:
+            break
+        replies = getattr(comment, "replies", None)
+        if replies and (max_depth is None or depth < max_depth):
+            queue.append((depth + 1, iter(replies)))
+
+    return [
+        {
+            "text": comment.body,
+            "score": comment.score,
+            "author": str(comment.author) if comment.author else "[deleted]"
+        }
+        for _, _, comment in sorted(heap, key=lambda entry: entry[:2], reverse=True)
+    ]
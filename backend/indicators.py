@@ -0,0 +1,178 @@
+import json
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional
+
+# Posts that look like they come from businesses/employers
+BUSINESS_INDICATORS = [
+    "hiring", "job opening", "position available", "we are looking for",
+    "company", "business", "startup", "entrepreneur", "looking to hire",
+    "recruiting", "employment", "career opportunity", "join our team",
+    "apply now", "submit your resume", "send your cv"
+]
+
+# Posts that describe a personal problem
+PROBLEM_INDICATORS = [
+    "i have", "i'm having", "i am having", "i struggle", "i'm struggling",
+    "i need help", "i can't", "i cannot", "i'm stuck", "i feel",
+    "my problem", "my issue", "my pain", "my struggle", "help me",
+    "advice needed", "anyone else", "does anyone", "how do you",
+    "what should i", "what can i", "feeling", "experiencing"
+]
+
+# Title keywords for targeted subreddit search; "*" matches any word ending
+HELP_KEYWORDS = ["help*", "problem*", "issue*", "struggl*", "question*", "advice", "recommend*"]
+
+
+WILDCARD = "*"
+
+
+def _units(pattern: str) -> List[str]:
+    """Split an indicator phrase into regex units for the pattern trie.
+
+    Whitespace matches any run of whitespace, apostrophes match straight or
+    curly quotes and a trailing "*" matches the rest of the word.
+    """
+    units = []
+    words = pattern.rstrip(WILDCARD).split()
+    for i, word in enumerate(words):
+        if i:
+            units.append(r"\s+")
+        units.extend("['’]" if char == "'" else re.escape(char) for char in word)
+    if pattern.endswith(WILDCARD):
+        units.append(r"\w*")
+    return units
+
+
+def _trie_regex(node: Dict) -> str:
+    """Render a unit trie as a regex whose alternations share common prefixes.
+
+    The wildcard unit is tried last, so a longer phrase continuing the same
+    prefix ("help me" next to "help*") wins over the bare wildcard match.
+    """
+    terminal = "" in node
+    units = sorted((unit for unit in node if unit != ""), key=lambda unit: unit == r"\w*")
+    branches = [unit + _trie_regex(node[unit]) for unit in units]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return f"(?:{body})?" if terminal else body
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().replace("’", "'").split())
+
+
+class KeywordMatcher:
+    """Multi-pattern phrase matcher compiled into a single regex.
+
+    Patterns match case-insensitively on word boundaries, so "company" does
+    not match "accompany". The patterns are compiled from a trie, so each
+    text position follows one branch instead of trying every pattern, and
+    scan cost stays roughly flat as the list grows. Hits are counted per
+    pattern.
+    """
+
+    def __init__(self, name: str, patterns: Iterable[str]):
+        self.name = name
+        self.patterns: List[str] = list(dict.fromkeys(_normalize(p) for p in patterns if p.strip()))
+        trie: Dict = {}
+        for pattern in self.patterns:
+            node = trie
+            for unit in _units(pattern):
+                node = node.setdefault(unit, {})
+            node[""] = {}
+        self._regex = re.compile(rf"(?<!\w){_trie_regex(trie)}(?!\w)", re.IGNORECASE) if self.patterns else None
+        self._exact = {p for p in self.patterns if not p.endswith(WILDCARD)}
+        # Longest prefixes first so the most specific wildcard gets the hit
+        self._prefixes = sorted((p for p in self.patterns if p.endswith(WILDCARD)), key=len, reverse=True)
+        self._lock = threading.Lock()
+        self.hits: Dict[str, int] = {pattern: 0 for pattern in self.patterns}
+        self.texts_scanned = 0
+        self.texts_matched = 0
+
+    def _pattern_for(self, matched_text: str) -> str:
+        """Map matched text back to the indicator that produced it"""
+        normalized = _normalize(matched_text)
+        if normalized in self._exact:
+            return normalized
+        for prefix in self._prefixes:
+            if normalized.startswith(prefix[:-1]):
+                return prefix
+        return normalized
+
+    def _record(self, found: List[str]):
+        with self._lock:
+            self.texts_scanned += 1
+            if found:
+                self.texts_matched += 1
+            for pattern in found:
+                self.hits[pattern] = self.hits.get(pattern, 0) + 1
+
+    def first_match(self, text: Optional[str]) -> Optional[str]:
+        """Return the first indicator found in text, or None"""
+        if not text or self._regex is None:
+            self._record([])
+            return None
+        match = self._regex.search(text)
+        if match is None:
+            self._record([])
+            return None
+        pattern = self._pattern_for(match.group())
+        self._record([pattern])
+        return pattern
+
+    def matches(self, text: Optional[str]) -> bool:
+        """Check whether text contains any indicator"""
+        return self.first_match(text) is not None
+
+    def find_all(self, text: Optional[str]) -> List[str]:
+        """Return every indicator occurrence in text, in order"""
+        if not text or self._regex is None:
+            self._record([])
+            return []
+        found = [self._pattern_for(match.group()) for match in self._regex.finditer(text)]
+        self._record(found)
+        return found
+
+    def match_many(self, texts: Iterable[Optional[str]]) -> List[bool]:
+        """Check a batch of texts; returns one flag per text"""
+        return [self.matches(text) for text in texts]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            top_hits = sorted(((p, n) for p, n in self.hits.items() if n), key=lambda item: item[1], reverse=True)
+            return {
+                "name": self.name,
+                "patterns": len(self.patterns),
+                "textsScanned": self.texts_scanned,
+                "textsMatched": self.texts_matched,
+                "hits": dict(top_hits),
+            }
+
+
+def load_indicator_lists(path: Optional[str]) -> Dict[str, List[str]]:
+    """Load indicator lists, letting an optional JSON file override the defaults.
+
+    The file may define any of "business", "problem" and "help" as lists of
+    phrases; lists it leaves out keep their defaults.
+    """
+    lists = {"business": BUSINESS_INDICATORS, "problem": PROBLEM_INDICATORS, "help": HELP_KEYWORDS}
+    if path and os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                overrides = json.load(f)
+            for key in lists:
+                if isinstance(overrides.get(key), list):
+                    lists[key] = overrides[key]
+            print(f"Loaded indicator lists from {path}")
+        except Exception as e:
+            print(f"Error loading indicator file {path}: {e}")
+    return lists
+
+
+_lists = load_indicator_lists(os.getenv("INDICATOR_FILE"))
+business_matcher = KeywordMatcher("business", _lists["business"])
+problem_matcher = KeywordMatcher("problem", _lists["problem"])
+help_matcher = KeywordMatcher("help", _lists["help"])
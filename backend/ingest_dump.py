@@ -0,0 +1,197 @@
+"""Ingest archived Reddit dumps into the local post corpus.
+
+Dumps are NDJSON files with one submission or comment per line, usually
+zstd-compressed (``.zst``, as in the Pushshift/Arctic Shift archives):
+
+    python ingest_dump.py RS_2024-01.zst RC_2024-01.zst --subreddits freelance,smallbusiness
+
+Files are decompressed as a stream and written in batches, so memory use
+stays flat however large the dump is. Submissions pass the same business and
+problem filters as live searches; comments are attached to submissions
+already in the corpus, so ingest submission files before comment files.
+Reading ``.zst`` files needs the optional zstandard package
+(``pip install zstandard``).
+"""
+import argparse
+import io
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+from dotenv import load_dotenv
+
+from indicators import KeywordMatcher, business_matcher, problem_matcher
+from post_corpus import PostCorpus
+
+load_dotenv()
+
+CORPUS_FILE = os.getenv("CORPUS_FILE", "reddit_corpus.db")
+
+# Pushshift dumps are compressed with long-distance matching and need a 2 GB window
+ZSTD_MAX_WINDOW_SIZE = 2 ** 31
+
+REMOVED_TEXTS = {"[removed]", "[deleted]"}
+
+
+def open_lines(path: str) -> Iterator[str]:
+    """Yield the lines of a plain or zstd-compressed NDJSON file, decompressing as a stream"""
+    if not path.endswith(".zst"):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            yield from f
+        return
+    try:
+        import zstandard
+    except ImportError:
+        raise SystemExit("Reading .zst dumps needs the zstandard package: pip install zstandard")
+    with open(path, "rb") as f:
+        reader = zstandard.ZstdDecompressor(max_window_size=ZSTD_MAX_WINDOW_SIZE).stream_reader(f)
+        yield from io.TextIOWrapper(reader, encoding="utf-8", errors="replace")
+
+
+def clean_text(text: Optional[str]) -> str:
+    return "" if not text or text.strip() in REMOVED_TEXTS else text
+
+
+def submission_record(item: Dict) -> Dict:
+    """Corpus record for a dumped submission"""
+    permalink = item.get("permalink") or f"/comments/{item['id']}/"
+    return {
+        "id": item["id"],
+        "subreddit": item.get("subreddit") or "",
+        "title": item.get("title") or "",
+        "selftext": clean_text(item.get("selftext")),
+        "url": f"https://www.reddit.com{permalink}",
+        "score": item.get("score") or 0,
+        "num_comments": item.get("num_comments") or 0,
+        "created_utc": float(item.get("created_utc") or 0),
+    }
+
+
+def is_relevant(record: Dict) -> bool:
+    """Same business/problem filter as live /search-reddit results"""
+    post_text = f"{record['title']}\n{record['selftext']}"
+    if business_matcher.matches(post_text):
+        return False
+    return problem_matcher.matches(post_text) or len(record["selftext"]) > 100
+
+
+class DumpIngest:
+    """Streams dump lines into a PostCorpus in fixed-size batches"""
+
+    def __init__(self, corpus: PostCorpus, subreddits: Optional[List[str]] = None,
+                 since: Optional[float] = None, until: Optional[float] = None,
+                 keywords: Optional[List[str]] = None, batch_size: int = 1000):
+        self.corpus = corpus
+        self.subreddits = {name.lower() for name in subreddits} if subreddits else None
+        self.since = since
+        self.until = until
+        self.keyword_matcher = KeywordMatcher("keywords", keywords) if keywords else None
+        self.batch_size = batch_size
+        self.posts: List[Dict] = []
+        self.comments: Dict[str, List[Dict]] = {}
+        self.pending_comments = 0
+        self.counts = {"lines": 0, "invalid": 0, "skipped": 0, "posts": 0, "comments": 0, "commentedPosts": 0}
+
+    def _in_scope(self, item: Dict) -> bool:
+        """Subreddit and date filters, applied to submissions only"""
+        if self.subreddits is not None and (item.get("subreddit") or "").lower() not in self.subreddits:
+            return False
+        created = float(item.get("created_utc") or 0)
+        if self.since is not None and created < self.since:
+            return False
+        return self.until is None or created < self.until
+
+    def add_line(self, line: str):
+        self.counts["lines"] += 1
+        try:
+            item = json.loads(line)
+        except ValueError:
+            self.counts["invalid"] += 1
+            return
+        if not isinstance(item, dict) or "id" not in item:
+            self.counts["skipped"] += 1
+            return
+
+        if "title" in item:
+            if not self._in_scope(item):
+                self.counts["skipped"] += 1
+                return
+            record = submission_record(item)
+            text = f"{record['title']}\n{record['selftext']}"
+            if (self.keyword_matcher and not self.keyword_matcher.matches(text)) or not is_relevant(record):
+                self.counts["skipped"] += 1
+                return
+            self.posts.append(record)
+        elif "body" in item and str(item.get("link_id", "")).startswith("t3_"):
+            # Comments are kept when their submission is in the corpus
+            body = clean_text(item.get("body"))
+            if len(body.strip()) <= 10:
+                self.counts["skipped"] += 1
+                return
+            self.comments.setdefault(item["link_id"][3:], []).append({
+                "id": item["id"],
+                "text": body,
+                "score": item.get("score") or 0,
+                "author": item.get("author") or "[deleted]",
+            })
+            self.pending_comments += 1
+        else:
+            self.counts["skipped"] += 1
+            return
+
+        if len(self.posts) + self.pending_comments >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.posts:
+            self.counts["posts"] += self.corpus.add_posts(self.posts, source="dump")
+            self.posts = []
+        if self.comments:
+            posts_updated, comments_stored = self.corpus.merge_comments(self.comments)
+            self.counts["commentedPosts"] += posts_updated
+            self.counts["comments"] += comments_stored
+            self.counts["skipped"] += self.pending_comments - comments_stored
+            self.comments = {}
+            self.pending_comments = 0
+
+    def ingest_file(self, path: str, progress_every: int = 100000):
+        started = time.monotonic()
+        before = dict(self.counts)
+        for line in open_lines(path):
+            self.add_line(line)
+            if self.counts["lines"] % progress_every == 0:
+                print(f"{path}: {self.counts['lines'] - before['lines']} lines read")
+        self.flush()
+        counts = {name: self.counts[name] - before[name] for name in self.counts}
+        print(f"Ingested {path} in {time.monotonic() - started:.1f}s: {counts}")
+
+
+def parse_date(value: str) -> float:
+    """Timestamp for a YYYY-MM-DD date (UTC)"""
+    return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest Reddit NDJSON dumps (.zst or plain) into the post corpus")
+    parser.add_argument("files", nargs="+", help="Submission and/or comment dump files")
+    parser.add_argument("--corpus", default=CORPUS_FILE, help="Corpus SQLite file (default: CORPUS_FILE)")
+    parser.add_argument("--subreddits", help="Comma-separated subreddits to keep")
+    parser.add_argument("--since", type=parse_date, help="Keep items created on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--until", type=parse_date, help="Keep items created before this date (YYYY-MM-DD)")
+    parser.add_argument("--keywords", help="Comma-separated phrases; keep only submissions mentioning one")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Items written per transaction")
+    args = parser.parse_args()
+
+    ingest = DumpIngest(
+        PostCorpus(args.corpus),
+        subreddits=args.subreddits.split(",") if args.subreddits else None,
+        since=args.since,
+        until=args.until,
+        keywords=args.keywords.split(",") if args.keywords else None,
+        batch_size=args.batch_size,
+    )
+    for path in args.files:
+        ingest.ingest_file(path)
+    print(ingest.corpus.stats())
@@ -0,0 +1,226 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from cache import make_cache_key
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+FINISHED_STATUSES = (COMPLETED, FAILED)
+
+# handler(payload, report) -> result; report(progress) records a progress note
+JobHandler = Callable[[Dict, Callable[[str], None]], Awaitable[Any]]
+
+
+class JobStore:
+    """Persistent SQLite store for background jobs and their results"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                dedup_key TEXT NOT NULL,
+                status TEXT NOT NULL,
+                progress TEXT,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_dedup ON jobs(dedup_key, status)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_finished ON jobs(finished_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def _to_dict(row: Optional[sqlite3.Row]) -> Optional[Dict]:
+        if row is None:
+            return None
+        return {
+            "jobId": row["id"],
+            "kind": row["kind"],
+            "payload": json.loads(row["payload"]),
+            "status": row["status"],
+            "progress": row["progress"],
+            "result": json.loads(row["result"]) if row["result"] is not None else None,
+            "error": row["error"],
+            "createdAt": row["created_at"],
+            "startedAt": row["started_at"],
+            "finishedAt": row["finished_at"],
+        }
+
+    def create(self, kind: str, payload: Dict, dedup_key: str) -> Dict:
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO jobs (id, kind, payload, dedup_key, status, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, kind, json.dumps(payload), dedup_key, QUEUED, time.time()),
+                )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row)
+
+    def find_active(self, dedup_key: str) -> Optional[Dict]:
+        """Find a queued or running job with the same kind and payload"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE dedup_key = ? AND status IN (?, ?) ORDER BY created_at LIMIT 1",
+                (dedup_key, *ACTIVE_STATUSES),
+            ).fetchone()
+        return self._to_dict(row)
+
+    def update(self, job_id: str, **fields):
+        columns = {
+            "status": "status", "progress": "progress", "error": "error",
+            "started_at": "started_at", "finished_at": "finished_at",
+        }
+        assignments, values = [], []
+        for name, value in fields.items():
+            if name == "result":
+                assignments.append("result = ?")
+                values.append(json.dumps(value))
+            else:
+                assignments.append(f"{columns[name]} = ?")
+                values.append(value)
+        with self._lock:
+            with self._conn:
+                self._conn.execute(f"UPDATE jobs SET {', '.join(assignments)} WHERE id = ?", (*values, job_id))
+
+    def interrupted_jobs(self) -> List[str]:
+        """Reset jobs left queued or running by a previous process and return their IDs"""
+        with self._lock:
+            with self._conn:
+                rows = self._conn.execute(
+                    "SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created_at", ACTIVE_STATUSES
+                ).fetchall()
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?", (QUEUED, RUNNING)
+                )
+        return [row["id"] for row in rows]
+
+    def prune(self, older_than: float) -> int:
+        """Delete finished jobs that finished before the given timestamp"""
+        with self._lock:
+            with self._conn:
+                return self._conn.execute(
+                    "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (older_than,)
+                ).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+
+class JobQueue:
+    """Runs registered job handlers on a fixed set of background worker tasks"""
+
+    def __init__(self, store: JobStore, workers: int = 2, result_ttl: float = 7 * 24 * 3600):
+        self.store = store
+        self.workers = max(1, workers)
+        self.result_ttl = result_ttl
+        self.handlers: Dict[str, JobHandler] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._submit_lock = threading.Lock()
+
+    def register(self, kind: str, handler: JobHandler):
+        self.handlers[kind] = handler
+
+    async def start(self):
+        """Start the workers and re-queue jobs interrupted by a restart"""
+        self._queue = asyncio.Queue()
+        pruned = self.store.prune(time.time() - self.result_ttl)
+        if pruned:
+            print(f"Pruned {pruned} expired jobs")
+        for job_id in self.store.interrupted_jobs():
+            self._queue.put_nowait(job_id)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, kind: str, payload: Dict) -> Tuple[Dict, bool]:
+        """Queue a job, or return the identical job already in flight.
+
+        Returns (job, created) where created is False for a deduplicated submit.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind '{kind}'")
+        dedup_key = make_cache_key(kind, payload)
+        with self._submit_lock:
+            existing = self.store.find_active(dedup_key)
+            if existing:
+                return existing, False
+            job = self.store.create(kind, payload, dedup_key)
+        self._queue.put_nowait(job["jobId"])
+        return job, True
+
+    async def _worker(self, index: int):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                print(f"Job worker {index} error for job {job_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        job = self.store.get(job_id)
+        if not job or job["status"] != QUEUED:
+            return
+        handler = self.handlers.get(job["kind"])
+        if handler is None:
+            self.store.update(job_id, status=FAILED, error=f"Unknown job kind '{job['kind']}'", finished_at=time.time())
+            return
+
+        def report(progress: str):
+            self.store.update(job_id, progress=progress)
+
+        print(f"Starting job {job_id} ({job['kind']})")
+        self.store.update(job_id, status=RUNNING, started_at=time.time())
+        try:
+            result = await handler(job["payload"], report)
+        except asyncio.CancelledError:
+            # Shutting down: leave the job to be re-queued on next start
+            raise
+        except Exception as e:
+            detail = getattr(e, "detail", None) or str(e)
+            print(f"Job {job_id} failed: {detail}")
+            self.store.update(job_id, status=FAILED, error=str(detail), finished_at=time.time())
+            return
+        self.store.update(job_id, status=COMPLETED, result=result, finished_at=time.time())
+        print(f"Finished job {job_id} ({job['kind']})")
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "jobs": self.store.counts(),
+        }
@@ -0,0 +1,207 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import random
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+# Lanes in priority order: a waiting interactive call is always admitted first
+LANES = (INTERACTIVE, BATCH)
+
+# Lane for LLM calls made in the current context (jobs run in the batch lane)
+current_lane: contextvars.ContextVar[str] = contextvars.ContextVar("llm_lane", default=INTERACTIVE)
+
+
+class TokenBucket:
+    """Continuously refilling budget of `per_minute` units (0 = unlimited).
+
+    Consumption may overdraw the bucket; later callers then wait for the
+    debt to be refilled.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount units are available"""
+        if self.capacity <= 0:
+            return 0.0
+        self._refill(now)
+        deficit = min(amount, self.capacity) - self.level
+        return deficit / self.rate if deficit > 0 else 0.0
+
+    def consume(self, amount: float, now: float):
+        if self.capacity <= 0:
+            return
+        self._refill(now)
+        self.level -= amount
+
+
+class Reservation:
+    """Budget taken for one call; settle() corrects it once real usage is known"""
+
+    def __init__(self, gateway: "LLMGateway", tokens: int):
+        self.gateway = gateway
+        self.tokens = tokens
+
+    def settle(self, actual_tokens: Optional[int]):
+        if actual_tokens is None:
+            return
+        with self.gateway._lock:
+            self.gateway.token_bucket.consume(actual_tokens - self.tokens, time.monotonic())
+            self.gateway.tokens_used += actual_tokens - self.tokens
+        self.tokens = actual_tokens
+
+
+class LLMGateway:
+    """Admits LLM calls under requests-per-minute and tokens-per-minute budgets.
+
+    Calls wait in one queue ordered by lane, then arrival, and are admitted
+    when the concurrency limit and both token buckets allow it. Rate-limited
+    calls are retried with jittered exponential backoff (at least the
+    server's Retry-After), and the whole gateway pauses for that delay so
+    queued calls do not run into the same limit.
+    """
+
+    def __init__(self, rpm: float = 0, tpm: float = 0, max_concurrency: int = 8, retries: int = 4,
+                 backoff_base: float = 2, backoff_max: float = 30, poll_interval: float = 0.05):
+        self.request_bucket = TokenBucket(rpm)
+        self.token_bucket = TokenBucket(tpm)
+        self.max_concurrency = max(1, max_concurrency)
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._queue: list = []
+        self._counter = itertools.count()
+        self._paused_until = 0.0
+        self.active = 0
+        self.admitted = {lane: 0 for lane in LANES}
+        self.waiting = {lane: 0 for lane in LANES}
+        self.wait_seconds = {lane: 0.0 for lane in LANES}
+        self.rate_limited_calls = 0
+        self.tokens_used = 0
+
+    async def _acquire(self, tokens: int, lane: str):
+        ticket = (LANES.index(lane), next(self._counter))
+        started = time.monotonic()
+        with self._lock:
+            heapq.heappush(self._queue, ticket)
+            self.waiting[lane] += 1
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    wait = self.poll_interval
+                    if self._queue[0] == ticket and self.active < self.max_concurrency:
+                        wait = max(
+                            self._paused_until - now,
+                            self.request_bucket.wait_time(1, now),
+                            self.token_bucket.wait_time(tokens, now),
+                        )
+                        if wait <= 0:
+                            heapq.heappop(self._queue)
+                            self.request_bucket.consume(1, now)
+                            self.token_bucket.consume(tokens, now)
+                            self.active += 1
+                            self.admitted[lane] += 1
+                            self.tokens_used += tokens
+                            self.wait_seconds[lane] += now - started
+                            return
+                # Re-check at least every poll interval so a newly queued
+                # interactive call can overtake a waiting batch call
+                await asyncio.sleep(min(wait, self.poll_interval))
+        finally:
+            with self._lock:
+                self.waiting[lane] -= 1
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                    heapq.heapify(self._queue)
+
+    def _release(self):
+        with self._lock:
+            self.active -= 1
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int, lane: Optional[str] = None):
+        """Hold an admission slot for one call; yields a Reservation"""
+        lane = lane if lane in LANES else current_lane.get()
+        await self._acquire(estimated_tokens, lane)
+        try:
+            yield Reservation(self, estimated_tokens)
+        finally:
+            self._release()
+
+    def pause(self, seconds: float):
+        """Hold back every queued call for the given number of seconds"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def rate_limited(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Record a rate-limited attempt and pause for its backoff; returns the delay"""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt) * random.uniform(0.5, 1.0)
+        delay = max(delay, retry_after or 0)
+        with self._lock:
+            self.rate_limited_calls += 1
+        print(f"Rate limited by OpenAI, retrying in {delay:.1f}s (attempt {attempt + 1})")
+        self.pause(delay)
+        return delay
+
+    async def call(self, fn: Callable[[], Awaitable[Any]], estimated_tokens: int,
+                   retry_after: Callable[[Exception], Optional[float]],
+                   usage: Optional[Callable[[Any], Optional[int]]] = None,
+                   lane: Optional[str] = None) -> Any:
+        """Run `await fn()` once admitted, retrying rate-limited attempts.
+
+        retry_after(exc) returns the server's Retry-After in seconds (0 if it
+        sent none) for a rate-limit error and None for any other error, which
+        is raised immediately. usage(result), if given, returns the tokens the
+        call actually used.
+        """
+        for attempt in range(self.retries + 1):
+            async with self.slot(estimated_tokens, lane) as reservation:
+                try:
+                    result = await fn()
+                except Exception as e:
+                    server_delay = retry_after(e)
+                    if server_delay is None or attempt == self.retries:
+                        raise
+                    # The rejected attempt used no tokens; refund its estimate
+                    reservation.settle(0)
+                    self.rate_limited(attempt, server_delay)
+                    continue
+                if usage is not None:
+                    reservation.settle(usage(result))
+                return result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "active": self.active,
+                "maxConcurrency": self.max_concurrency,
+                "waiting": dict(self.waiting),
+                "admitted": dict(self.admitted),
+                "averageWaitSeconds": {
+                    lane: round(self.wait_seconds[lane] / self.admitted[lane], 3) if self.admitted[lane] else 0.0
+                    for lane in LANES
+                },
+                "rateLimited": self.rate_limited_calls,
+                "tokensUsed": self.tokens_used,
+                "requestBudget": round(self.request_bucket.level, 1) if self.request_bucket.capacity else None,
+                "tokenBudget": round(self.token_bucket.level) if self.token_bucket.capacity else None,
+                "pausedFor": round(max(0.0, self._paused_until - now), 1),
+            }
@@ -1,9 +1,13 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Literal, Optional
 import openai
 import praw
+import requests
+import httpx
+from prawcore.exceptions import TooManyRequests
 from pytrends.request import TrendReq
 import os
 from dotenv import load_dotenv
@@ -12,40 +16,215 @@ import random
 from pydantic import validator
 from datetime import datetime, timedelta
 import asyncio
+import importlib.util
+import time
+from workers import WorkerPool
+from client_registry import ClientRegistry, ClientSet, current_client_key
+from llm_gateway import LLMGateway, BATCH, current_lane
+from collectors import PostCollector, SessionRegistry
+from subreddit_index import SubredditIndex
+from subreddit_catalog import SubredditCatalog, SORT_ORDERS
+from metadata_refresher import MetadataRefresher
+from post_corpus import PostCorpus
+from comment_selector import top_comments
+from post_ranking import rank_posts, DEFAULT_WEIGHTS as DEFAULT_RANKING_WEIGHTS
+from trends import TrendsService, MAX_KEYWORDS_PER_PAYLOAD
+from trend_analytics import summarize as summarize_trends
+from cache import create_cache, make_cache_key
+from chunker import chunk_contents, count_tokens
+from cluster_merge import merge_clusters
+from pain_extraction import extract_pain_content
+from streaming import sse_response
+from indicators import KeywordMatcher, business_matcher, problem_matcher, help_matcher
+from jobs import JobQueue, JobStore, FINISHED_STATUSES, COMPLETED, FAILED
 
 # Load environment variables
 load_dotenv()
 
-# Subreddit metadata storage
+# Bounded worker pool for blocking PRAW calls
+REDDIT_MAX_WORKERS = int(os.getenv("REDDIT_MAX_WORKERS", "8"))
+reddit_pool = WorkerPool("reddit", REDDIT_MAX_WORKERS)
+
+# Posts requested per search; raise these to collect hundreds of posts per query
+REDDIT_SEARCH_LIMIT = int(os.getenv("REDDIT_SEARCH_LIMIT", "30"))
+REDDIT_TARGETED_LIMIT = int(os.getenv("REDDIT_TARGETED_LIMIT", "10"))
+
+# Per-session memory of returned posts, for cross-request deduplication
+session_registry = SessionRegistry(
+    max_sessions=int(os.getenv("SESSION_MAX_COUNT", "1000")),
+    ttl=float(os.getenv("SESSION_TTL", "3600"))
+)
+
+# Per-request fan-out limits for /search-reddit-targeted
+TARGETED_SEARCH_CONCURRENCY = int(os.getenv("TARGETED_SEARCH_CONCURRENCY", "6"))
+TARGETED_SEARCH_TIMEOUT = float(os.getenv("TARGETED_SEARCH_TIMEOUT", "15"))
+
+# Parallel comment-tree fetches per /search-reddit request
+COMMENT_HYDRATION_CONCURRENCY = int(os.getenv("COMMENT_HYDRATION_CONCURRENCY", "8"))
+
+# Comments kept per post (highest score first) and the bounds of the comment tree walk
+COMMENT_TOP_K = int(os.getenv("COMMENT_TOP_K", "10"))
+COMMENT_MIN_LENGTH = int(os.getenv("COMMENT_MIN_LENGTH", "10"))
+COMMENT_MAX_DEPTH = int(os.getenv("COMMENT_MAX_DEPTH", "-1"))  # -1 = no limit
+COMMENT_MAX_VISITED = int(os.getenv("COMMENT_MAX_VISITED", "2000"))
+
+# Local corpus of every fetched post; searches answer from it and only fetch
+# posts newer than the last ingest of the same query from Reddit
+CORPUS_FILE = os.getenv("CORPUS_FILE", "reddit_corpus.db")
+CORPUS_REFRESH_AFTER = float(os.getenv("CORPUS_REFRESH_AFTER", "3600"))
+CORPUS_COMMENTS_TTL = float(os.getenv("CORPUS_COMMENTS_TTL", "86400"))
+CORPUS_SEARCH_LIMIT = int(os.getenv("CORPUS_SEARCH_LIMIT", "200"))
+CORPUS_SEARCH_CANDIDATES = int(os.getenv("CORPUS_SEARCH_CANDIDATES", "2000"))
+post_corpus = PostCorpus(CORPUS_FILE)
+
+# Blocking SQLite corpus calls run on their own pool so large full-text searches never block the event loop
+CORPUS_MAX_WORKERS = int(os.getenv("CORPUS_MAX_WORKERS", "4"))
+corpus_pool = WorkerPool("corpus", CORPUS_MAX_WORKERS)
+
+# Weights of the post ranking components (relevance to the query, recency,
+# engagement, problem-indicator density) and the recency half-life
+RANKING_WEIGHTS = {
+    name: float(os.getenv(f"RANKING_WEIGHT_{name.upper()}", str(default)))
+    for name, default in DEFAULT_RANKING_WEIGHTS.items()
+}
+RANKING_HALF_LIFE_DAYS = float(os.getenv("RANKING_HALF_LIFE_DAYS", "90"))
+
+# Separate matcher so ranking scans do not show up in /indicator-stats
+ranking_matcher = KeywordMatcher("ranking", problem_matcher.patterns)
+
+# Live searches cover posts from the last year (Reddit's "year" time filter);
+# corpus-only searches (source="corpus") cover everything ingested, including dumps
+SEARCH_WINDOW_SECONDS = 365 * 86400
+
+# Shared cache for Reddit search results ("memory" or "sqlite" backend)
+search_cache = create_cache(
+    "reddit-search",
+    backend=os.getenv("SEARCH_CACHE_BACKEND", "memory"),
+    ttl=float(os.getenv("SEARCH_CACHE_TTL", "900")),
+    max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "512")),
+    path=os.getenv("SEARCH_CACHE_FILE", "search_cache.db")
+)
+
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4")
+
+# Opt-in deterministic OpenAI mode with an on-disk response cache
+OPENAI_DETERMINISTIC = os.getenv("OPENAI_DETERMINISTIC", "false").lower() in ("1", "true", "yes")
+OPENAI_SEED = int(os.getenv("OPENAI_SEED", "42"))
+llm_cache = create_cache(
+    "openai",
+    backend="sqlite",
+    ttl=float(os.getenv("LLM_CACHE_TTL", "86400")),
+    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000")),
+    path=os.getenv("LLM_CACHE_FILE", "llm_cache.db")
+) if OPENAI_DETERMINISTIC else None
+
+# OpenAI calls are async and go through a gateway that budgets requests and
+# tokens per minute, prioritizes interactive calls over jobs and backs off on 429s
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+OPENAI_RPM = float(os.getenv("OPENAI_RPM", "500"))
+OPENAI_TPM = float(os.getenv("OPENAI_TPM", "30000"))
+OPENAI_RATE_LIMIT_RETRIES = int(os.getenv("OPENAI_RATE_LIMIT_RETRIES", "4"))
+OPENAI_BACKOFF_BASE = float(os.getenv("OPENAI_BACKOFF_BASE", "2"))
+OPENAI_BACKOFF_MAX = float(os.getenv("OPENAI_BACKOFF_MAX", "30"))
+llm_gateway = LLMGateway(
+    rpm=OPENAI_RPM,
+    tpm=OPENAI_TPM,
+    max_concurrency=OPENAI_MAX_CONCURRENCY,
+    retries=OPENAI_RATE_LIMIT_RETRIES,
+    backoff_base=OPENAI_BACKOFF_BASE,
+    backoff_max=OPENAI_BACKOFF_MAX
+)
+
+# Chunks analyzed in parallel per /process-pain-points request
+PAIN_POINT_PARALLELISM = int(os.getenv("PAIN_POINT_PARALLELISM", "4"))
+
+# Token budget per analysis chunk; prompt and 1000-token answer must still fit the model context
+PAIN_POINT_CHUNK_TOKENS = int(os.getenv("PAIN_POINT_CHUNK_TOKENS", "4000"))
+
+# Similarity (0-1) at which clusters from different parts are merged
+CLUSTER_MERGE_THRESHOLD = float(os.getenv("CLUSTER_MERGE_THRESHOLD", "0.6"))
+
+# Local pain-sentence extraction before analysis: sentences kept per post and
+# preceding sentences kept as context for each
+PAIN_EXTRACTION = os.getenv("PAIN_EXTRACTION", "true").lower() in ("1", "true", "yes")
+PAIN_EXTRACTION_MAX_SENTENCES = int(os.getenv("PAIN_EXTRACTION_MAX_SENTENCES", "10"))
+PAIN_EXTRACTION_CONTEXT = int(os.getenv("PAIN_EXTRACTION_CONTEXT", "0"))
+
+async def search_cache_endpoint(endpoint, source):
+    """Cache namespace of a search endpoint and source.
+
+    Corpus-only results are keyed by the corpus version, so posts ingested
+    since (e.g. from a dump) are not hidden behind an earlier cached result.
+    """
+    if source == "corpus":
+        return f"{endpoint}-corpus-{await corpus_pool.run(post_corpus.version)}"
+    return f"{endpoint}-{source}"
+
+def search_cache_key(endpoint, query, subreddits, sort, time_filter):
+    """Cache key for a Reddit search: normalized query, subreddit set, sort and time filter"""
+    normalized_query = " ".join(query.lower().split())
+    normalized_subreddits = sorted({name.strip().lower() for name in subreddits})
+    return make_cache_key(endpoint, normalized_query, normalized_subreddits, sort, time_filter)
+
+# Google Trends: pooled sessions and a persistent interest-over-time cache
+TRENDS_TIMEFRAME = os.getenv("TRENDS_TIMEFRAME", "today 12-m")
+trends_service = TrendsService(
+    lambda: TrendReq(hl='en-US', tz=360, timeout=(10,25), retries=2, backoff_factor=0.1),
+    create_cache(
+        "trends",
+        backend="sqlite",
+        ttl=float(os.getenv("TRENDS_CACHE_TTL", str(7 * 24 * 3600))),
+        max_entries=int(os.getenv("TRENDS_CACHE_MAX_ENTRIES", "5000")),
+        path=os.getenv("TRENDS_CACHE_FILE", "trends_cache.db")
+    ),
+    sessions=int(os.getenv("TRENDS_SESSIONS", "2")),
+    refresh_after=float(os.getenv("TRENDS_REFRESH_AFTER", "43200")),
+    cooldown=float(os.getenv("TRENDS_COOLDOWN", "300"))
+)
+
+# Blocking pytrends/pandas work runs on its own pool so slow Trends calls never block the event loop
+TRENDS_MAX_WORKERS = int(os.getenv("TRENDS_MAX_WORKERS", "4"))
+TRENDS_TIMEOUT = float(os.getenv("TRENDS_TIMEOUT", "45"))
+trends_pool = WorkerPool("trends", TRENDS_MAX_WORKERS)
+
+# Subreddit metadata storage; the JSON file seeds the SQLite catalog on first run
 SUBREDDIT_METADATA_FILE = "subreddit_metadata.json"
+SUBREDDIT_CATALOG_FILE = os.getenv("SUBREDDIT_CATALOG_FILE", "subreddit_catalog.db")
+
+# Page size limits for /get-all-subreddits
+SUBREDDIT_PAGE_SIZE = int(os.getenv("SUBREDDIT_PAGE_SIZE", "100"))
+SUBREDDIT_MAX_PAGE_SIZE = int(os.getenv("SUBREDDIT_MAX_PAGE_SIZE", "1000"))
 
 class SubredditMetadata:
     def __init__(self):
-        self.metadata = self.load_metadata()
+        self.catalog = SubredditCatalog(SUBREDDIT_CATALOG_FILE)
+        if self.catalog.count() == 0:
+            self.catalog.import_metadata(self.load_metadata())
+            print(f"Imported {self.catalog.count()} subreddits into {SUBREDDIT_CATALOG_FILE}")
+        self.rebuild_index()
+    
+    def rebuild_index(self):
+        """Rebuild the inverted topic index after the catalog changes"""
+        self.index = SubredditIndex(self.catalog.all())
+    
+    def get_categories(self) -> Dict[str, List[str]]:
+        """Subreddit names grouped by category"""
+        return self.catalog.categories()
     
     def load_metadata(self) -> Dict:
-        """Load subreddit metadata from local file"""
+        """Load seed subreddit metadata from the local JSON file"""
         try:
             if os.path.exists(SUBREDDIT_METADATA_FILE):
                 with open(SUBREDDIT_METADATA_FILE, 'r') as f:
                     return json.load(f)
             else:
                 # Initialize with default business/tech subreddits
-                default_metadata = self.get_default_metadata()
-                self.save_metadata(default_metadata)
-                return default_metadata
+                return self.get_default_metadata()
         except Exception as e:
             print(f"Error loading metadata: {e}")
             return self.get_default_metadata()
     
-    def save_metadata(self, metadata: Dict):
-        """Save subreddit metadata to local file"""
-        try:
-            with open(SUBREDDIT_METADATA_FILE, 'w') as f:
-                json.dump(metadata, f, indent=2)
-        except Exception as e:
-            print(f"Error saving metadata: {e}")
-    
     def get_default_metadata(self) -> Dict:
         """Get default subreddit metadata for business/tech communities"""
         return {
@@ -153,8 +332,6 @@ class SubredditMetadata:
     
     def get_relevant_subreddits(self, user_profile: Dict) -> List[Dict]:
         """Get relevant subreddits based on user profile"""
-        relevant_subreddits = []
-        
         # Extract user interests
         interest = user_profile.get('interest', '').lower()
         skill = user_profile.get('skill', '').lower()
@@ -166,28 +343,21 @@ class SubredditMetadata:
         problem_weight = 6
         activity_weight = 5
         
-        for subreddit_name, subreddit_data in self.metadata["subreddits"].items():
-            score = 0
-            
-            # Score based on interest match
-            if interest in subreddit_data["topics"] or any(interest in topic for topic in subreddit_data["topics"]):
-                score += interest_weight
-            
-            # Score based on skill match
-            if skill in subreddit_data["topics"] or any(skill in topic for topic in subreddit_data["topics"]):
-                score += skill_weight
-            
-            # Score based on problem match
-            if problem in subreddit_data["topics"] or any(problem in topic for topic in subreddit_data["topics"]):
-                score += problem_weight
-            
-            # Score based on activity
-            score += subreddit_data["activity_score"] * activity_weight
-            
+        # Score matches of each term in topics, display names and categories
+        # through the inverted index, plus activity for every subreddit
+        ranked = self.index.rank(
+            [(interest, interest_weight), (skill, skill_weight), (problem, problem_weight)],
+            activity_weight,
+            limit=12
+        )
+        
+        relevant_subreddits = []
+        for position, score in ranked:
             # Add to relevant list if score > 0
             if score > 0:
+                subreddit_data = self.index.records[position]
                 relevant_subreddits.append({
-                    "name": subreddit_name,
+                    "name": self.index.names[position],
                     "display_name": subreddit_data["display_name"],
                     "category": subreddit_data["category"],
                     "subscribers": subreddit_data["subscribers"],
@@ -195,37 +365,73 @@ class SubredditMetadata:
                     "relevance_score": score
                 })
         
-        # Sort by relevance score (highest first) and return top 8-12
-        relevant_subreddits.sort(key=lambda x: x["relevance_score"], reverse=True)
-        return relevant_subreddits[:12]
-    
-    def update_metadata_from_reddit(self):
-        """Update metadata with current Reddit data"""
-        if not api_clients.reddit_client:
-            print("Reddit client not configured, skipping metadata update")
-            return
-        
-        try:
-            for subreddit_name in self.metadata["subreddits"]:
-                subreddit = api_clients.reddit_client.subreddit(subreddit_name)
-                self.metadata["subreddits"][subreddit_name]["subscribers"] = subreddit.subscribers
-                self.metadata["subreddits"][subreddit_name]["last_updated"] = datetime.now().isoformat()
-            
-            self.metadata["last_updated"] = datetime.now().isoformat()
-            self.save_metadata(self.metadata)
-            print("Subreddit metadata updated successfully")
-        except Exception as e:
-            print(f"Error updating metadata: {e}")
+        # Already sorted by relevance score (highest first), top 12
+        return relevant_subreddits
 
 # Initialize subreddit metadata
 subreddit_metadata = SubredditMetadata()
 
+# Connection pools for API clients; each credential set keeps its own warm pool
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+# HTTP/2 for OpenAI needs the optional h2 package (pip install httpx[http2])
+OPENAI_HTTP2 = os.getenv("OPENAI_HTTP2", "true").lower() == "true" and importlib.util.find_spec("h2") is not None
+CLIENT_REGISTRY_MAX = int(os.getenv("CLIENT_REGISTRY_MAX", "32"))
+CLIENT_KEY_HEADER = "X-Client-Key"
+
+def http_limits():
+    return httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+    )
+
+def build_async_openai_client(api_key: str):
+    """Async OpenAI client for the LLM gateway; 429s are retried by the gateway, not the SDK"""
+    return openai.AsyncOpenAI(
+        api_key=api_key,
+        base_url=OPENAI_BASE_URL,
+        max_retries=0,
+        timeout=60.0,
+        http_client=openai.DefaultAsyncHttpxClient(limits=http_limits(), http2=OPENAI_HTTP2)
+    )
+
+def build_reddit_client(client_id: str, client_secret: str, user_agent: str):
+    """Reddit client on a pooled keep-alive requests session"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(HTTP_MAX_CONNECTIONS, REDDIT_MAX_WORKERS))
+    session.mount("https://", adapter)
+    return praw.Reddit(
+        client_id=client_id,
+        client_secret=client_secret,
+        user_agent=user_agent,
+        check_for_async=False,
+        requestor_kwargs={"session": session}
+    )
+
 class APIClients:
     def __init__(self):
-        self.openai_client = None
-        self.reddit_client = None
+        self.registry = ClientRegistry(self._build, CLIENT_REGISTRY_MAX)
         self._configure_from_env()
 
+    # Clients for the current request: the set named by its client key, else the default set
+    @property
+    def async_openai_client(self):
+        return self.registry.current().async_openai_client
+
+    @async_openai_client.setter
+    def async_openai_client(self, client):
+        self.registry.default.async_openai_client = client
+
+    @property
+    def reddit_client(self):
+        return self.registry.current().reddit_client
+
+    @reddit_client.setter
+    def reddit_client(self, client):
+        self.registry.default.reddit_client = client
+
     def _configure_from_env(self):
         """Configure clients from environment variables if available"""
         openai_key = os.getenv("OPENAI_API_KEY")
@@ -234,52 +440,59 @@ class APIClients:
         reddit_agent = os.getenv("REDDIT_USER_AGENT", "IdeaSpark/1.0")
 
         if openai_key:
-            self.openai_client = openai.OpenAI(
-                api_key=openai_key,
-                base_url="https://api.openai.com/v1",
-                max_retries=3,
-                timeout=30.0
-            )
+            self.async_openai_client = build_async_openai_client(openai_key)
 
         if all([reddit_id, reddit_secret, reddit_agent]):
-            self.reddit_client = praw.Reddit(
-                client_id=reddit_id,
-                client_secret=reddit_secret,
-                user_agent=reddit_agent,
-                check_for_async=False
-            )
+            self.reddit_client = build_reddit_client(reddit_id, reddit_secret, reddit_agent)
 
-    def configure(self, config: Dict[str, str]) -> bool:
-        """Configure clients with provided credentials"""
-        try:
-            # Configure OpenAI
-            self.openai_client = openai.OpenAI(
-                api_key=config["openai_api_key"],
-                base_url="https://api.openai.com/v1",
-                max_retries=3,
-                timeout=30.0
-            )
+    def _build(self, config: Dict[str, str]) -> ClientSet:
+        clients = ClientSet(
+            build_async_openai_client(config["openai_api_key"]),
+            build_reddit_client(config["reddit_client_id"], config["reddit_client_secret"], config["reddit_user_agent"])
+        )
+        # Test Reddit connection
+        clients.reddit_client.user.me()
+        return clients
 
-            # Configure Reddit
-            self.reddit_client = praw.Reddit(
-                client_id=config["reddit_client_id"],
-                client_secret=config["reddit_client_secret"],
-                user_agent=config["reddit_user_agent"],
-                check_for_async=False
-            )
+    def configure(self, config: Dict[str, str]) -> Optional[str]:
+        """Configure clients with provided credentials and return their client key.
 
-            # Test Reddit connection
-            self.reddit_client.user.me()
-            return True
+        Known credentials reuse their existing clients. The configured set also
+        becomes the default for requests that send no client key, replacing any
+        clients configured from the environment.
+        """
+        try:
+            key, clients, created = self.registry.get_or_create(config)
+            print(f"{'Created' if created else 'Reused'} API clients {key[:8]}")
+            self.registry.default = clients
+            return key
         except Exception as e:
             print(f"Configuration error: {str(e)}")
-            return False
+            return None
 
 # Create a single instance of APIClients
 api_clients = APIClients()
 
 app = FastAPI()
 
+@app.middleware("http")
+async def select_api_clients(request: Request, call_next):
+    """Serve a request with the clients named by its X-Client-Key header, if any"""
+    client_key = request.headers.get(CLIENT_KEY_HEADER)
+    if client_key and client_key not in api_clients.registry:
+        return JSONResponse(status_code=401, content={"detail": "Unknown client key. Please configure the API again."})
+    token = current_client_key.set(client_key)
+    try:
+        return await call_next(request)
+    finally:
+        current_client_key.reset(token)
+
+@app.on_event("shutdown")
+async def shutdown_worker_pools():
+    reddit_pool.shutdown()
+    trends_pool.shutdown()
+    corpus_pool.shutdown()
+
 # API Configuration
 class APIConfig(BaseModel):
     openai_api_key: str
@@ -305,9 +518,10 @@ async def configure_api_options():
 async def configure_api(config: APIConfig):
     try:
         print("Starting API configuration...")
-        if api_clients.configure(config.dict()):
+        client_key = api_clients.configure(config.dict())
+        if client_key:
             print("API configuration completed successfully")
-            return {"status": "success", "message": "API configuration successful"}
+            return {"status": "success", "message": "API configuration successful", "clientKey": client_key}
         else:
             raise HTTPException(status_code=500, detail="Failed to configure APIs")
     except Exception as e:
@@ -317,8 +531,16 @@ async def configure_api(config: APIConfig):
 class ProfileInput(BaseModel):
     profile: dict
 
+# "live" searches Reddit (through the corpus); "corpus" serves only what is already stored
+SearchSource = Literal["live", "corpus"]
+
 class NicheInput(BaseModel):
     niche: str
+    session_id: Optional[str] = None  # Skip posts already returned to this session
+    source: SearchSource = "live"
+
+class NicheBatchInput(BaseModel):
+    niches: List[str] = Field(..., min_items=1, max_items=MAX_KEYWORDS_PER_PAYLOAD)
 
 class ThreadsInput(BaseModel):
     threads: str
@@ -352,132 +574,384 @@ class IdeasInput(BaseModel):
 
 def check_api_configuration():
     """Check if API clients are properly configured."""
-    if not api_clients.openai_client:
+    if not api_clients.async_openai_client:
         raise HTTPException(status_code=400, detail="OpenAI API not configured. Please configure the API first.")
     if not api_clients.reddit_client:
         raise HTTPException(status_code=400, detail="Reddit API not configured. Please configure the API first.")
 
-def call_openai(prompt):
-    """Call OpenAI API with randomized seed for varied responses."""
-    if not api_clients.openai_client:
+def build_openai_request(prompt):
+    """Build the chat completion request for a prompt (random seed unless deterministic)."""
+    if OPENAI_DETERMINISTIC:
+        user_prompt = prompt
+    else:
+        # Add random seed for variability
+        seed = random.randint(1, 10000)
+        user_prompt = f"{prompt}\nUse seed {seed} for varied responses."
+    request = {
+        "model": OPENAI_MODEL,
+        "messages": [
+            {"role": "system", "content": "You are a business strategist specializing in market research and idea generation."},
+            {"role": "user", "content": user_prompt},
+        ],
+        "max_tokens": 1000,
+        "temperature": 0.7,
+        "top_p": 0.9,
+        "frequency_penalty": 0.0,
+        "presence_penalty": 0.0
+    }
+    if OPENAI_DETERMINISTIC:
+        request["seed"] = OPENAI_SEED
+    return request
+
+def openai_error(e):
+    """Convert an OpenAI SDK exception into an HTTPException (429 for rate limits)."""
+    if isinstance(e, openai.RateLimitError):
+        print(f"OpenAI rate limit: {str(e)}")
+        retry_after = e.response.headers.get("retry-after") if e.response is not None else None
+        return HTTPException(
+            status_code=429,
+            detail=f"OpenAI rate limit exceeded: {str(e)}",
+            headers={"Retry-After": retry_after} if retry_after else None
+        )
+    print(f"OpenAI API call error: {str(e)}")
+    return HTTPException(status_code=500, detail=f"OpenAI API call failed: {str(e)}")
+
+def openai_retry_after(e):
+    """Retry-After seconds for an OpenAI rate-limit error (0 if not sent), None for other errors"""
+    if not isinstance(e, openai.RateLimitError):
+        return None
+    retry_after = e.response.headers.get("retry-after") if e.response is not None else None
+    try:
+        return float(retry_after) if retry_after else 0.0
+    except ValueError:
+        return 0.0
+
+def estimate_request_tokens(request):
+    """Tokens a request may use: its prompt plus the full completion budget"""
+    return sum(count_tokens(message["content"], OPENAI_MODEL) for message in request["messages"]) + request["max_tokens"]
+
+def get_async_openai_client():
+    client = api_clients.async_openai_client
+    if not client:
         raise HTTPException(status_code=500, detail="OpenAI client not initialized")
-    # Add random seed for variability
-    seed = random.randint(1, 10000)
-    prompt_with_seed = f"{prompt}\nUse seed {seed} for varied responses."
+    return client
+
+async def call_openai_async(prompt, cacheable=None):
+    """Call OpenAI through the LLM gateway with randomized seed for varied responses.
+
+    The gateway queues the call in the current lane (interactive, or batch
+    for jobs) until the RPM/TPM budgets allow it and retries 429s with
+    jittered backoff. In deterministic mode (OPENAI_DETERMINISTIC=true) the
+    random seed is dropped, a fixed API seed is sent and responses are served
+    from an on-disk cache keyed on the model, messages and sampling
+    parameters. cacheable, if given, decides whether a response text may be
+    cached.
+    """
+    client = get_async_openai_client()
+    request = build_openai_request(prompt)
+    if OPENAI_DETERMINISTIC:
+        cache_key = make_cache_key(request)
+        cached_content = llm_cache.get(cache_key)
+        if cached_content is not None:
+            print("LLM cache hit")  # Debug log
+            return cached_content
     try:
-        response = api_clients.openai_client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are a business strategist specializing in market research and idea generation."},
-                {"role": "user", "content": prompt_with_seed},
-            ],
-            max_tokens=1000,
-            temperature=0.7,
-            top_p=0.9,
-            frequency_penalty=0.0,
-            presence_penalty=0.0
+        response = await llm_gateway.call(
+            lambda: client.chat.completions.create(**request),
+            estimate_request_tokens(request),
+            retry_after=openai_retry_after,
+            usage=lambda response: response.usage.total_tokens if response.usage else None
         )
-        return response.choices[0].message.content
+        content = response.choices[0].message.content
     except Exception as e:
-        print(f"OpenAI API call error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"OpenAI API call failed: {str(e)}")
+        raise openai_error(e)
+    if OPENAI_DETERMINISTIC and content and (cacheable is None or cacheable(content)):
+        llm_cache.set(cache_key, content)
+    return content
+
+async def call_openai_stream(prompt, cacheable=None):
+    """Stream an OpenAI completion as text deltas through the LLM gateway.
+
+    The stream holds its gateway slot until it ends. A 429 when opening the
+    stream is retried like call_openai_async. In deterministic mode a cached
+    response is yielded as a single delta, and a completed stream is cached.
+    """
+    client = get_async_openai_client()
+    request = build_openai_request(prompt)
+    cache_key = make_cache_key(request) if OPENAI_DETERMINISTIC else None
+    if cache_key:
+        cached_content = llm_cache.get(cache_key)
+        if cached_content is not None:
+            print("LLM cache hit")  # Debug log
+            yield cached_content
+            return
+    
+    pieces = []
+    for attempt in range(llm_gateway.retries + 1):
+        async with llm_gateway.slot(estimate_request_tokens(request)) as reservation:
+            try:
+                stream = await client.chat.completions.create(
+                    stream=True, stream_options={"include_usage": True}, **request
+                )
+            except Exception as e:
+                retry_after = openai_retry_after(e)
+                if retry_after is None or attempt == llm_gateway.retries:
+                    raise openai_error(e)
+                # The rejected attempt used no tokens; refund its estimate
+                reservation.settle(0)
+                llm_gateway.rate_limited(attempt, retry_after)
+                continue
+            try:
+                async for chunk in stream:
+                    if chunk.usage:
+                        reservation.settle(chunk.usage.total_tokens)
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        pieces.append(chunk.choices[0].delta.content)
+                        yield chunk.choices[0].delta.content
+            except openai.OpenAIError as e:
+                raise openai_error(e)
+            finally:
+                # Also stops the response if the consumer went away mid-stream
+                await stream.close()
+        break
+    
+    content = "".join(pieces)
+    if cache_key and content and (cacheable is None or cacheable(content)):
+        llm_cache.set(cache_key, content)
+
+def is_json(text):
+    """Check whether an OpenAI response parses as JSON (used to gate caching)."""
+    try:
+        json.loads(text)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+def fetch_submissions(subreddit_name, query, sort="relevance", limit=30, time_filter="year"):
+    """Run a blocking PRAW search and materialize the listing (call via reddit_pool)."""
+    subreddit = api_clients.reddit_client.subreddit(subreddit_name)
+    return list(subreddit.search(query, sort=sort, limit=limit, time_filter=time_filter))
+
+def time_filter_since(timestamp):
+    """Narrowest Reddit search time filter that still covers posts since timestamp"""
+    age = time.time() - timestamp
+    for time_filter, span in (("hour", 3600), ("day", 86400), ("week", 7 * 86400), ("month", 31 * 86400)):
+        if age <= span:
+            return time_filter
+    return "year"
+
+def fetch_new_submissions(subreddit_name, query, after, limit=30):
+    """Search newest first, stopping at the first post not newer than after (call via reddit_pool)."""
+    subreddit = api_clients.reddit_client.subreddit(subreddit_name)
+    submissions = []
+    for submission in subreddit.search(query, sort="new", limit=limit, time_filter=time_filter_since(after)):
+        if submission.created_utc <= after:
+            break
+        submissions.append(submission)
+    return submissions
+
+def submission_record(submission):
+    """Corpus record for a PRAW submission"""
+    return {
+        "id": submission.id,
+        "subreddit": submission.subreddit.display_name,
+        "title": submission.title,
+        "selftext": submission.selftext or "",
+        "url": f"https://www.reddit.com{submission.permalink}",
+        "score": submission.score,
+        "num_comments": submission.num_comments,
+        "created_utc": submission.created_utc
+    }
+
+async def search_with_corpus(subreddit_name, query, fetch_limit, result_limit, timeout=None, source="live"):
+    """Posts matching query in a subreddit ("all" for everywhere), from the corpus plus Reddit.
+
+    A scope (query + subreddit) ingested within CORPUS_REFRESH_AFTER is
+    answered from the corpus alone. Otherwise the first fetch of a scope is a
+    relevance search, and later ones only ask Reddit for posts newer than the
+    newest post already ingested for it. Freshly fetched posts come first, in
+    Reddit's order, then the posts Reddit returned for the scope earlier,
+    then other full-text matches in the corpus from the last year.
+    With source="corpus" Reddit is never called and matches of any age are used.
+
+    Returns (records, {post ID: submission} for the posts fetched just now).
+    """
+    scope = search_cache_key("corpus", query, [subreddit_name], "relevance", "year")
+    state = await corpus_pool.run(post_corpus.ingest_state, scope)
+    fetched = []
+    if source == "live" and (state is None or time.time() - state["lastIngest"] >= CORPUS_REFRESH_AFTER):
+        if state is None:
+            fetched = await reddit_pool.run(
+                fetch_submissions, subreddit_name, query,
+                sort="relevance", limit=fetch_limit, time_filter="year", timeout=timeout
+            )
+        else:
+            after = state["newestCreated"] or state["lastIngest"]
+            fetched = await reddit_pool.run(
+                fetch_new_submissions, subreddit_name, query, after, limit=fetch_limit, timeout=timeout
+            )
+        records = [submission_record(submission) for submission in fetched]
+        await corpus_pool.run(post_corpus.add_posts, records)
+        await corpus_pool.run(
+            post_corpus.record_ingest,
+            scope,
+            max((record["created_utc"] for record in records), default=None),
+            [record["id"] for record in records]
+        )
+        print(f"Ingested {len(records)} new posts for '{query}' in r/{subreddit_name}")  # Debug log
+    else:
+        records = []
+    
+    since = time.time() - SEARCH_WINDOW_SECONDS if source == "live" else None
+    # Reddit matches posts the local full-text index may not (stemming,
+    # comments), so earlier results for the scope are served as they are
+    scoped = await corpus_pool.run(post_corpus.scope_posts, scope, since=since, limit=result_limit)
+    matched = await corpus_pool.run(
+        post_corpus.search,
+        query,
+        subreddits=None if subreddit_name.lower() == "all" else [subreddit_name],
+        since=since,
+        limit=result_limit,
+        candidates=CORPUS_SEARCH_CANDIDATES
+    )
+    merged = PostCollector()
+    for record in records + scoped + matched:
+        merged.add(record["id"], record)
+    return merged.posts()[:max(result_limit, len(records))], {submission.id: submission for submission in fetched}
+
+def fetch_comments(submission):
+    """Load a submission's comment tree and return its top comments (call via reddit_pool)."""
+    # "Load more comments" links are skipped by the walk, never expanded
+    return top_comments(
+        submission.comments,
+        k=COMMENT_TOP_K,
+        min_length=COMMENT_MIN_LENGTH,
+        max_depth=COMMENT_MAX_DEPTH if COMMENT_MAX_DEPTH >= 0 else None,
+        max_visited=COMMENT_MAX_VISITED
+    )
+
+async def hydrate_comments(submissions):
+    """Fetch comment trees for many submissions concurrently.
+
+    Fetches are bounded by COMMENT_HYDRATION_CONCURRENCY and run on the Reddit
+    worker pool. A failed fetch yields None for that post.
+    """
+    semaphore = asyncio.Semaphore(COMMENT_HYDRATION_CONCURRENCY)
+    
+    async def hydrate_one(submission):
+        async with semaphore:
+            try:
+                return await reddit_pool.run(fetch_comments, submission)
+            except Exception as e:
+                print(f"Error fetching comments for {submission.id}: {e}")
+                return None
+    
+    return await asyncio.gather(*(hydrate_one(submission) for submission in submissions))
+
+async def corpus_comments(records, submissions, source="live"):
+    """Top comments per post ID, from the corpus when fetched within CORPUS_COMMENTS_TTL.
 
-def scrape_reddit(query):
+    Other posts are hydrated from Reddit (reusing submissions fetched in this
+    request) and their comments stored in the corpus. With source="corpus"
+    stored comments of any age are used and nothing is fetched.
+    """
+    comments = await corpus_pool.run(
+        post_corpus.get_comments,
+        [record["id"] for record in records],
+        fetched_after=time.time() - CORPUS_COMMENTS_TTL if source == "live" else None
+    )
+    missing = [record["id"] for record in records if record["id"] not in comments]
+    if missing and source == "live":
+        comment_lists = await hydrate_comments([
+            submissions.get(post_id) or api_clients.reddit_client.submission(id=post_id) for post_id in missing
+        ])
+        for post_id, comment_list in zip(missing, comment_lists):
+            # Failed fetches are retried next time instead of being stored as empty
+            if comment_list is not None:
+                await corpus_pool.run(post_corpus.set_comments, post_id, comment_list)
+            comments[post_id] = comment_list or []
+    return comments
+
+async def scrape_reddit(query, source="live"):
     """Scrape Reddit threads - simple search for the exact query with comments."""
-    if not api_clients.reddit_client:
+    if source == "live" and not api_clients.reddit_client:
         raise HTTPException(status_code=500, detail="Reddit client not initialized")
     
+    cache_key = search_cache_key(await search_cache_endpoint("search-reddit", source), query, ["all"], "relevance", "year")
+    cached_posts = search_cache.get(cache_key)
+    if cached_posts is not None:
+        print(f"Search cache hit for '{query}'")  # Debug log
+        return cached_posts
+    
     posts = []
     print(f"Searching Reddit for: '{query}'")  # Debug log
     
     try:
-        # Simple search across all of Reddit for the exact query
-        search_results = api_clients.reddit_client.subreddit("all").search(
-            query, 
-            sort="relevance", 
-            limit=30, 
-            time_filter="year"
+        # Search across all of Reddit for the exact query, answered from the
+        # local corpus plus any posts newer than the last ingest
+        records, submissions = await search_with_corpus(
+            "all", query, REDDIT_SEARCH_LIMIT, CORPUS_SEARCH_LIMIT, source=source
         )
         
-        collected_posts = []
+        candidates = PostCollector()
+        problem_counts = {}
         
-        for submission in search_results:
+        for record in records:
             # Skip if already collected
-            if any(post["url"] == f"https://www.reddit.com{submission.permalink}" for post in collected_posts):
+            if record["id"] in candidates:
                 continue
                 
             # Filter for posts that are likely from people with problems (not employers/companies)
-            title_lower = submission.title.lower()
-            content_lower = (submission.selftext or "").lower()
+            post_text = f"{record['title']}\n{record['selftext']}"
             
             # Skip posts that seem to be from businesses/employers
-            business_indicators = [
-                "hiring", "job opening", "position available", "we are looking for",
-                "company", "business", "startup", "entrepreneur", "looking to hire",
-                "recruiting", "employment", "career opportunity", "join our team",
-                "apply now", "submit your resume", "send your cv"
-            ]
-            
-            if any(indicator in title_lower or indicator in content_lower for indicator in business_indicators):
+            if business_matcher.matches(post_text):
                 continue
             
             # Look for indicators that this is a personal problem post
-            problem_indicators = [
-                "i have", "i'm having", "i am having", "i struggle", "i'm struggling",
-                "i need help", "i can't", "i cannot", "i'm stuck", "i feel",
-                "my problem", "my issue", "my pain", "my struggle", "help me",
-                "advice needed", "anyone else", "does anyone", "how do you",
-                "what should i", "what can i", "feeling", "experiencing"
-            ]
-            
-            has_problem_indicator = any(indicator in title_lower or indicator in content_lower 
-                                      for indicator in problem_indicators)
+            problem_hits = problem_matcher.find_all(post_text)
             
             # Only include posts that have problem indicators or are clearly personal
-            if has_problem_indicator or len(submission.selftext or "") > 100:
-                # Get comments for this post
-                submission.comments.replace_more(limit=0)  # Remove "load more comments" links
-                comments = []
-                
-                for comment in submission.comments.list()[:10]:  # Get top 10 comments
-                    if hasattr(comment, 'body') and comment.body and len(comment.body.strip()) > 10:
-                        comments.append({
-                            "text": comment.body,
-                            "score": comment.score,
-                            "author": str(comment.author) if comment.author else "[deleted]"
-                        })
-                
-                # Sort comments by score
-                comments.sort(key=lambda x: x["score"], reverse=True)
-                
-                # Combine post content with top comments
-                full_content = submission.selftext if submission.selftext else ""
-                if comments:
-                    full_content += "\n\n--- COMMENTS ---\n"
-                    for comment in comments[:5]:  # Include top 5 comments
-                        full_content += f"\nComment by {comment['author']} (score: {comment['score']}):\n{comment['text']}\n"
-                
-                collected_posts.append({
-                    "title": submission.title,
-                    "content": full_content,
-                    "url": f"https://www.reddit.com{submission.permalink}",
-                    "subreddit": submission.subreddit.display_name,
-                    "score": submission.score,
-                    "num_comments": submission.num_comments,
-                    "created_utc": submission.created_utc
-                })
-                
-            # Stop if we have enough posts
-            if len(collected_posts) >= 30:
-                break
+            if problem_hits or len(record["selftext"]) > 100:
+                candidates.add(record["id"], record)
+                problem_counts[record["id"]] = len(problem_hits)
         
-        # Sort by relevance (score + comments) and take top 20
-        collected_posts.sort(key=lambda x: (x["score"] + x["num_comments"]), reverse=True)
+        # Rank all candidates in one batch and take the top 20. Ranking only
+        # uses post fields, so posts that miss the cut are never hydrated.
+        candidates = candidates.posts()
+        order = rank_posts(
+            query, candidates, [problem_counts[record["id"]] for record in candidates],
+            RANKING_WEIGHTS, RANKING_HALF_LIFE_DAYS
+        )
+        candidates = [candidates[i] for i in order[:20]]
         
-        # Take top 20 posts
-        posts = collected_posts[:20]
+        # Get comments for the remaining posts, from the corpus where possible
+        comments_by_post = await corpus_comments(candidates, submissions, source)
+        
+        for record in candidates:
+            comments = comments_by_post.get(record["id"], [])
+            # Combine post content with top comments
+            full_content = record["selftext"]
+            if comments:
+                full_content += "\n\n--- COMMENTS ---\n"
+                for comment in comments[:5]:  # Include top 5 comments
+                    full_content += f"\nComment by {comment['author']} (score: {comment['score']}):\n{comment['text']}\n"
+            
+            posts.append({
+                "id": record["id"],
+                "title": record["title"],
+                "content": full_content,
+                "url": record["url"],
+                "subreddit": record["subreddit"],
+                "score": record["score"],
+                "num_comments": record["num_comments"],
+                "created_utc": record["created_utc"]
+            })
         
         print(f"Found {len(posts)} relevant posts for '{query}'")  # Debug log
+        # Empty results are not cached; they are often a transient Reddit miss
+        if posts:
+            search_cache.set(cache_key, posts)
         
     except Exception as e:
         print(f"Reddit search error for '{query}': {str(e)}")
@@ -504,154 +978,233 @@ async def generate_niches(input: ProfileInput):
     Generate 5 relevant market niches with brief descriptions.
     Return a list in JSON format: [{{"name": "Niche", "description": "Description"}}, ...]
     """
-    response = call_openai(prompt)
+    response = await call_openai_async(prompt, cacheable=is_json)
     try:
         niches = json.loads(response)
     except json.JSONDecodeError:
         raise HTTPException(status_code=500, detail="Failed to parse OpenAI response")
     return {"niches": [niche["name"] for niche in niches]}
 
+MOCK_DEMAND_LABELS = ["Jan 2024", "Feb 2024", "Mar 2024", "Apr 2024", "May 2024", "Jun 2024",
+                      "Jul 2024", "Aug 2024", "Sep 2024", "Oct 2024", "Nov 2024", "Dec 2024"]
+MOCK_SEARCH_VOLUME = [50, 55, 60, 65, 70, 75, 80, 85, 90, 85, 80, 85]
+
+def mock_demand(note):
+    """Mock demand data returned when Google Trends has nothing for a niche"""
+    return {"labels": MOCK_DEMAND_LABELS, "searchVolume": MOCK_SEARCH_VOLUME, "trend": "Growing",
+            "mock": True, "analytics": None, "note": note}
+
+def demand_responses(niches, series_by_niche):
+    """Build /validate-demand responses for niches, analyzing all real series in one batch"""
+    found = [niche for niche in niches if series_by_niche.get(niche.strip())]
+    analytics = summarize_trends([series_by_niche[niche.strip()]["searchVolume"] for niche in found])
+    analytics_by_niche = dict(zip(found, analytics))
+    
+    responses = []
+    for niche in niches:
+        series = series_by_niche.get(niche.strip())
+        if not series:
+            responses.append(mock_demand(f"Mock data for '{niche}' - No Google Trends data available"))
+            continue
+        stats = analytics_by_niche[niche]
+        response = {
+            "labels": series["labels"],
+            "searchVolume": series["searchVolume"],
+            "trend": stats["trend"],
+            "mock": False,
+            "analytics": stats
+        }
+        if series["stale"]:
+            fetched = datetime.fromtimestamp(series["fetchedAt"]).strftime('%Y-%m-%d %H:%M')
+            response["note"] = f"Cached Google Trends data from {fetched} - Google Trends unavailable"
+        responses.append(response)
+    return responses
+
+async def until_disconnected(request, awaitable, poll_interval=0.5):
+    """Await a result, giving up with 499 as soon as the client disconnects.
+
+    A Trends call already running on the pool still finishes and fills the
+    cache, so a retry by the same client is answered from it.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if request is not None and await request.is_disconnected():
+                raise HTTPException(status_code=499, detail="Client closed request")
+    finally:
+        if not task.done():
+            task.cancel()
+
+async def fetch_trends(request, niches):
+    """Look up Trends series on the trends pool, bounded by TRENDS_TIMEOUT"""
+    return await until_disconnected(
+        request, trends_pool.run(trends_service.get_interest, niches, TRENDS_TIMEFRAME, timeout=TRENDS_TIMEOUT)
+    )
+
 @app.post("/validate-demand")
-async def validate_demand(input: NicheInput):
+async def validate_demand(input: NicheInput, request: Request = None):
     check_api_configuration()
     niche = input.niche
     
     try:
-        # Reinitialize PyTrends to avoid caching
-        pytrends = TrendReq(hl='en-US', tz=360, timeout=(10,25), retries=2, backoff_factor=0.1)
-        
-        # Build payload with error handling
-        try:
-            pytrends.build_payload([niche], timeframe='today 12-m')
-        except Exception as build_error:
-            print(f"PyTrends build_payload error: {str(build_error)}")
-            # Return mock data if Google Trends fails
-            return {
-                "labels": ["Jan 2024", "Feb 2024", "Mar 2024", "Apr 2024", "May 2024", "Jun 2024", 
-                          "Jul 2024", "Aug 2024", "Sep 2024", "Oct 2024", "Nov 2024", "Dec 2024"],
-                "searchVolume": [50, 55, 60, 65, 70, 75, 80, 85, 90, 85, 80, 85],
-                "trend": "Growing",
-                "note": "Mock data - Google Trends unavailable"
-            }
-        
-        # Get interest over time data
-        try:
-            data = pytrends.interest_over_time()
-        except Exception as data_error:
-            print(f"PyTrends interest_over_time error: {str(data_error)}")
-            # Return mock data if data fetch fails
-            return {
-                "labels": ["Jan 2024", "Feb 2024", "Mar 2024", "Apr 2024", "May 2024", "Jun 2024", 
-                          "Jul 2024", "Aug 2024", "Sep 2024", "Oct 2024", "Nov 2024", "Dec 2024"],
-                "searchVolume": [50, 55, 60, 65, 70, 75, 80, 85, 90, 85, 80, 85],
-                "trend": "Growing",
-                "note": "Mock data - Google Trends unavailable"
-            }
-        
-        if not data.empty and niche in data.columns:
-            search_volume = data[niche].tolist()
-            labels = data.index.strftime('%b %Y').tolist()
-            
-            # Calculate trend
-            if len(search_volume) >= 2:
-                trend = "Growing" if search_volume[-1] > search_volume[0] else "Stable" if search_volume[-1] == search_volume[0] else "Declining"
-            else:
-                trend = "Stable"
-                
-            return {"labels": labels, "searchVolume": search_volume, "trend": trend}
-        else:
-            # Return mock data if no data available
-            return {
-                "labels": ["Jan 2024", "Feb 2024", "Mar 2024", "Apr 2024", "May 2024", "Jun 2024", 
-                          "Jul 2024", "Aug 2024", "Sep 2024", "Oct 2024", "Nov 2024", "Dec 2024"],
-                "searchVolume": [50, 55, 60, 65, 70, 75, 80, 85, 90, 85, 80, 85],
-                "trend": "Growing",
-                "note": f"Mock data for '{niche}' - No Google Trends data available"
-            }
-            
+        series = await fetch_trends(request, [niche])
+        return demand_responses([niche], series)[0]
+    except HTTPException:
+        raise
+    except asyncio.TimeoutError:
+        print(f"Validate demand timed out for niche '{niche}'")
+        return mock_demand(f"Mock data for '{niche}' - Google Trends timed out")
     except Exception as e:
         print(f"Validate demand error for niche '{niche}': {str(e)}")
         # Return mock data instead of throwing an error
-        return {
-            "labels": ["Jan 2024", "Feb 2024", "Mar 2024", "Apr 2024", "May 2024", "Jun 2024", 
-                      "Jul 2024", "Aug 2024", "Sep 2024", "Oct 2024", "Nov 2024", "Dec 2024"],
-            "searchVolume": [50, 55, 60, 65, 70, 75, 80, 85, 90, 85, 80, 85],
-            "trend": "Growing",
-            "note": f"Mock data for '{niche}' - Error: {str(e)}"
-        }
+        return mock_demand(f"Mock data for '{niche}' - Error: {str(e)}")
+
+@app.post("/validate-demand-batch")
+async def validate_demand_batch(input: NicheBatchInput, request: Request = None):
+    """Validate demand for up to five niches with a single Trends payload"""
+    check_api_configuration()
+    try:
+        series = await fetch_trends(request, input.niches)
+    except HTTPException:
+        raise
+    except asyncio.TimeoutError:
+        print(f"Validate demand timed out for niches {input.niches}")
+        series = {}
+    except Exception as e:
+        print(f"Validate demand error for niches {input.niches}: {str(e)}")
+        series = {}
+    responses = demand_responses(input.niches, series)
+    return {"results": [{"niche": niche, **response} for niche, response in zip(input.niches, responses)]}
 
 @app.post("/search-reddit")
 async def search_reddit(input: NicheInput):
-    check_api_configuration()
+    if input.source == "live":
+        check_api_configuration()
     query = input.niche
-    reddit_posts = scrape_reddit(query)
-    return {"redditPosts": reddit_posts}
+    reddit_posts = await scrape_reddit(query, input.source)
+    return {"redditPosts": session_registry.filter_new(input.session_id, reddit_posts)}
 
-@app.post("/process-pain-points")
-async def process_pain_points(input: PainPointsInput):
-    check_api_configuration()
-    try:
-        print("Received request data:", input.dict())  # Debug log
-        pain_points = input.painPoints
+async def analyze_pain_points(pain_points, on_part=None):
+    """Run the pain point analysis and return the analysis dict.
+
+    on_part, if given, is awaited as on_part(index, total_parts, part_analysis)
+    as soon as each part finishes, in completion order. With PAIN_EXTRACTION
+    on, posts are first cut down to their pain sentences and the analysis
+    includes an "extraction" report of what was dropped.
+    """
+    extraction = None
+    if PAIN_EXTRACTION and pain_points:
+        contents = [str(point).strip() for point in pain_points if str(point).strip()]
+        pain_points, extraction = extract_pain_content(
+            contents, OPENAI_MODEL, PAIN_EXTRACTION_MAX_SENTENCES, PAIN_EXTRACTION_CONTEXT
+        )
+        print(f"Pain extraction kept {extraction['sentencesKept']}/{extraction['sentences']} sentences, "
+              f"{extraction['tokensAfter']}/{extraction['tokensBefore']} tokens")
+    
+    analysis = await analyze_contents(pain_points, on_part)
+    if extraction is not None and isinstance(analysis, dict):
+        analysis["extraction"] = extraction
+    return analysis
+
+async def analyze_contents(pain_points, on_part=None):
+    """Chunk the contents, analyze every part and merge the clusters."""
+    if not pain_points:
+        return {"clusters": [], "summary": {"totalClusters": 0}}
         
-        if not pain_points:
-            return {"analysis": {"clusters": [], "summary": {"totalClusters": 0}}}
-            
-        # Ensure pain points are strings and not empty
-        pain_points = [str(point).strip() for point in pain_points if str(point).strip()]
-        if not pain_points:
-            return {"analysis": {"clusters": [], "summary": {"totalClusters": 0}}}
-            
-        selected_contents = pain_points
-        combined_threads_content = "\n\n".join(selected_contents)
+    # Ensure pain points are strings and not empty
+    pain_points = [str(point).strip() for point in pain_points if str(point).strip()]
+    if not pain_points:
+        return {"clusters": [], "summary": {"totalClusters": 0}}
         
-        # Check if content is too long (OpenAI has token limits)
-        if len(combined_threads_content) > 8000:  # Rough estimate for token limit
-            print("Content too long, splitting into parts...")
-            # Split content into parts
-            parts = []
-            current_part = ""
-            for content in selected_contents:
-                if len(current_part + content) > 6000:
-                    if current_part:
-                        parts.append(current_part)
-                    current_part = content
-                else:
-                    current_part += "\n\n" + content if current_part else content
-            if current_part:
-                parts.append(current_part)
-            
-            # Process each part separately
-            all_clusters = []
-            for i, part in enumerate(parts):
+    selected_contents = pain_points
+    combined_threads_content = "\n\n".join(selected_contents)
+    
+    # Pack posts into chunks by real token count for the configured model,
+    # splitting oversized posts on comment and paragraph boundaries
+    parts = chunk_contents(selected_contents, PAIN_POINT_CHUNK_TOKENS, OPENAI_MODEL)
+    if len(parts) > 1:
+        print(f"Content too long, split into {len(parts)} parts...")
+        
+        # Process parts concurrently (bounded); gather keeps part order
+        semaphore = asyncio.Semaphore(PAIN_POINT_PARALLELISM)
+        
+        async def process_part(i, part):
+            async with semaphore:
                 print(f"Processing part {i+1}/{len(parts)}")
                 part_analysis = await process_content_part(part, f"Part {i+1}")
-                if part_analysis and "clusters" in part_analysis:
-                    all_clusters.extend(part_analysis["clusters"])
-            
-            # Combine all clusters
-            if all_clusters:
-                analysis = {
-                    "clusters": all_clusters,
-                    "summary": {
-                        "totalClusters": len(all_clusters),
-                        "mostIntenseCluster": max(all_clusters, key=lambda x: x.get("emotionIntensity", 0))["name"] if all_clusters else "",
-                        "biggestSolutionGap": max(all_clusters, key=lambda x: x.get("solutionGap", 0))["name"] if all_clusters else "",
-                        "mostFrequentCluster": max(all_clusters, key=lambda x: x.get("frequency", 0))["name"] if all_clusters else ""
-                    }
+            if on_part:
+                await on_part(i, len(parts), part_analysis)
+            return part_analysis
+        
+        part_analyses = await asyncio.gather(*(process_part(i, part) for i, part in enumerate(parts)))
+        
+        all_clusters = []
+        for part_analysis in part_analyses:
+            if part_analysis and "clusters" in part_analysis:
+                all_clusters.extend(part_analysis["clusters"])
+        
+        # Deduplicate clusters that different parts named slightly differently
+        merged_clusters = merge_clusters(all_clusters, CLUSTER_MERGE_THRESHOLD)
+        print(f"Merged {len(all_clusters)} clusters into {len(merged_clusters)}")
+        all_clusters = merged_clusters
+        
+        # Combine all clusters
+        if all_clusters:
+            return {
+                "clusters": all_clusters,
+                "summary": {
+                    "totalClusters": len(all_clusters),
+                    "mostIntenseCluster": max(all_clusters, key=lambda x: x.get("emotionIntensity", 0))["name"] if all_clusters else "",
+                    "biggestSolutionGap": max(all_clusters, key=lambda x: x.get("solutionGap", 0))["name"] if all_clusters else "",
+                    "mostFrequentCluster": max(all_clusters, key=lambda x: x.get("frequency", 0))["name"] if all_clusters else ""
                 }
-                return {"analysis": analysis}
-            else:
-                return {"analysis": {"clusters": [], "summary": {"totalClusters": 0}}}
+            }
         else:
-            # Process normally if content is not too long
-            analysis = await process_content_part(combined_threads_content, "Full Content")
-            return {"analysis": analysis}
-            
+            return {"clusters": [], "summary": {"totalClusters": 0}}
+    else:
+        # Process normally if content is not too long
+        analysis = await process_content_part(combined_threads_content, "Full Content")
+        if on_part:
+            await on_part(0, 1, analysis)
+        return analysis
+
+@app.post("/process-pain-points")
+async def process_pain_points(input: PainPointsInput):
+    check_api_configuration()
+    try:
+        print("Received request data:", input.dict())  # Debug log
+        analysis = await analyze_pain_points(input.painPoints)
+        return {"analysis": analysis}
     except Exception as e:
         print("Error processing pain points:", str(e))  # Debug log
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/process-pain-points/stream")
+async def process_pain_points_stream(input: PainPointsInput):
+    """Stream pain point analysis as server-sent events.
+
+    Emits a "part" event with the clusters of each analyzed part as soon as
+    it completes, then a "result" event with the same {"analysis": ...}
+    payload /process-pain-points returns.
+    """
+    check_api_configuration()
+    
+    async def produce(emit):
+        async def on_part(index, total_parts, part_analysis):
+            await emit("part", {
+                "part": index + 1,
+                "totalParts": total_parts,
+                "clusters": (part_analysis or {}).get("clusters", [])
+            })
+        
+        analysis = await analyze_pain_points(input.painPoints, on_part)
+        await emit("result", {"analysis": analysis})
+    
+    return sse_response(produce)
+
 async def process_content_part(content, part_name):
     """Process a single part of the content."""
     prompt = f"""
@@ -693,7 +1246,7 @@ Focus on real pain points mentioned in the text. If no clear pain points are fou
 """
     
     print(f"Sending prompt to OpenAI for {part_name}")  # Debug log
-    response = call_openai(prompt)
+    response = await call_openai_async(prompt, cacheable=lambda text: "clusters" in text)
     print(f"Received OpenAI response for {part_name}:", response)  # Debug log
     
     try:
@@ -734,9 +1287,8 @@ Focus on real pain points mentioned in the text. If no clear pain points are fou
         print(f"Unexpected error for {part_name}: {str(e)}")
         return {"clusters": []}
 
-@app.post("/generate-ideas")
-async def generate_ideas(input: IdeasInput):
-    check_api_configuration()
+def build_ideas_prompt(input: IdeasInput):
+    """Build the business idea prompt from the profile and selected pain points."""
     profile = input.profile
     interest = profile.get('interestOther') if profile.get('interest') == 'Other' else profile.get('interest')
     skill = profile.get('skillOther') if profile.get('skill') == 'Other' else profile.get('skill')
@@ -800,13 +1352,42 @@ async def generate_ideas(input: IdeasInput):
     - Leveraging emerging trends
     - Different from existing solutions
     """
-    response = call_openai(prompt)
+    return prompt
+
+@app.post("/generate-ideas")
+async def generate_ideas(input: IdeasInput):
+    check_api_configuration()
+    prompt = build_ideas_prompt(input)
+    response = await call_openai_async(prompt, cacheable=is_json)
     try:
         ideas = json.loads(response)
     except json.JSONDecodeError:
         raise HTTPException(status_code=500, detail="Failed to parse OpenAI response")
     return {"ideas": ideas}
 
+@app.post("/generate-ideas/stream")
+async def generate_ideas_stream(input: IdeasInput):
+    """Stream idea generation as server-sent events.
+
+    Emits "token" events with each text delta from the model, then a
+    "result" event with the same {"ideas": ...} payload /generate-ideas returns.
+    """
+    check_api_configuration()
+    prompt = build_ideas_prompt(input)
+    
+    async def produce(emit):
+        pieces = []
+        async for text in call_openai_stream(prompt, cacheable=is_json):
+            pieces.append(text)
+            await emit("token", {"text": text})
+        try:
+            ideas = json.loads("".join(pieces))
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=500, detail="Failed to parse OpenAI response")
+        await emit("result", {"ideas": ideas})
+    
+    return sse_response(produce)
+
 # New endpoints for subreddit management
 class SubredditSuggestionInput(BaseModel):
     profile: dict
@@ -814,6 +1395,8 @@ class SubredditSuggestionInput(BaseModel):
 class SubredditSearchInput(BaseModel):
     query: str
     selected_subreddits: List[str] = []
+    session_id: Optional[str] = None  # Skip posts already returned to this session
+    source: SearchSource = "live"
 
 @app.post("/get-relevant-subreddits")
 async def get_relevant_subreddits(input: SubredditSuggestionInput):
@@ -822,7 +1405,7 @@ async def get_relevant_subreddits(input: SubredditSuggestionInput):
         relevant_subreddits = subreddit_metadata.get_relevant_subreddits(input.profile)
         return {
             "suggested_subreddits": relevant_subreddits,
-            "categories": subreddit_metadata.metadata["categories"]
+            "categories": subreddit_metadata.get_categories()
         }
     except Exception as e:
         print(f"Error getting relevant subreddits: {str(e)}")
@@ -831,77 +1414,406 @@ async def get_relevant_subreddits(input: SubredditSuggestionInput):
 @app.post("/search-reddit-targeted")
 async def search_reddit_targeted(input: SubredditSearchInput):
     """Search Reddit in specific subreddits only"""
-    check_api_configuration()
+    if input.source == "live":
+        check_api_configuration()
     
     if not input.selected_subreddits:
         raise HTTPException(status_code=400, detail="No subreddits selected")
     
+    query = input.query
+    cache_key = search_cache_key(
+        await search_cache_endpoint("search-reddit-targeted", input.source),
+        query, input.selected_subreddits, "relevance", "year"
+    )
+    cached_response = search_cache.get(cache_key)
+    if cached_response is not None:
+        print(f"Search cache hit for '{query}' in {len(input.selected_subreddits)} subreddits")  # Debug log
+        cached_response["redditPosts"] = session_registry.filter_new(input.session_id, cached_response["redditPosts"])
+        return cached_response
+    
     try:
-        posts = []
-        query = input.query
+        posts = PostCollector()
         
-        for subreddit_name in input.selected_subreddits:
-            try:
-                subreddit = api_clients.reddit_client.subreddit(subreddit_name)
-                search_results = subreddit.search(
-                    query, 
-                    sort="relevance", 
-                    limit=10, 
-                    time_filter="year"
+        # Fan out one search per subreddit, capped per request so a long
+        # subreddit list cannot take over the whole Reddit worker pool
+        semaphore = asyncio.Semaphore(TARGETED_SEARCH_CONCURRENCY)
+        
+        async def search_one(subreddit_name):
+            async with semaphore:
+                records, _ = await search_with_corpus(
+                    subreddit_name,
+                    query,
+                    REDDIT_TARGETED_LIMIT,
+                    REDDIT_TARGETED_LIMIT,
+                    timeout=TARGETED_SEARCH_TIMEOUT,
+                    source=input.source
                 )
-                
-                for submission in search_results:
-                    # Skip if already collected
-                    if any(post["url"] == f"https://www.reddit.com{submission.permalink}" for post in posts):
-                        continue
-                    
-                    # Filter for relevant posts
-                    title_lower = submission.title.lower()
-                    if any(word in title_lower for word in ["help", "problem", "issue", "struggle", "question", "advice", "recommendation"]):
-                        posts.append({
-                            "title": submission.title,
-                            "content": submission.selftext[:500] if submission.selftext else "",
-                            "url": f"https://www.reddit.com{submission.permalink}",
-                            "subreddit": subreddit_name,
-                            "score": submission.score,
-                            "num_comments": submission.num_comments
-                        })
-            except Exception as e:
-                print(f"Error searching subreddit {subreddit_name}: {e}")
+                return records
+        
+        results = await asyncio.gather(
+            *(search_one(subreddit_name) for subreddit_name in input.selected_subreddits),
+            return_exceptions=True
+        )
+        
+        # Merge results from every subreddit; slow or failing subreddits are
+        # reported instead of failing the whole search
+        failed_subreddits = []
+        matches = []
+        for subreddit_name, search_results in zip(input.selected_subreddits, results):
+            if isinstance(search_results, asyncio.TimeoutError):
+                print(f"Timed out searching subreddit {subreddit_name}")
+                failed_subreddits.append({"subreddit": subreddit_name, "error": "timeout"})
                 continue
+            if isinstance(search_results, Exception):
+                print(f"Error searching subreddit {subreddit_name}: {search_results}")
+                failed_subreddits.append({"subreddit": subreddit_name, "error": str(search_results)})
+                continue
+            
+            for record in search_results:
+                # Skip if already collected
+                if record["id"] in posts:
+                    continue
+                
+                # Filter for relevant posts
+                if help_matcher.matches(record["title"]):
+                    posts.add(record["id"], {
+                        "id": record["id"],
+                        "title": record["title"],
+                        "content": record["selftext"][:500],
+                        "url": record["url"],
+                        "subreddit": subreddit_name,
+                        "score": record["score"],
+                        "num_comments": record["num_comments"]
+                    })
+                    matches.append(record)
+        
+        # Best posts first across all subreddits
+        order = rank_posts(
+            query,
+            matches,
+            [len(ranking_matcher.find_all(f"{record['title']}\n{record['selftext']}")) for record in matches],
+            RANKING_WEIGHTS,
+            RANKING_HALF_LIFE_DAYS
+        )
+        collected = posts.posts()
         
-        return {"redditPosts": posts}
+        response = {"redditPosts": [collected[i] for i in order], "failedSubreddits": failed_subreddits}
+        # Partial and empty results are not cached so the next call retries Reddit
+        if not failed_subreddits and response["redditPosts"]:
+            search_cache.set(cache_key, response)
+        response["redditPosts"] = session_registry.filter_new(input.session_id, response["redditPosts"])
+        return response
     except Exception as e:
         print(f"Error in targeted Reddit search: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Background refresh of subreddit metadata from the Reddit API
+METADATA_REFRESH_BATCH_SIZE = int(os.getenv("METADATA_REFRESH_BATCH_SIZE", "8"))
+METADATA_STALE_AFTER = float(os.getenv("METADATA_STALE_AFTER", "86400"))
+METADATA_REFRESH_INTERVAL = float(os.getenv("METADATA_REFRESH_INTERVAL", "21600"))
+METADATA_FETCH_TIMEOUT = float(os.getenv("METADATA_FETCH_TIMEOUT", "30"))
+
+def fetch_subreddit_metadata(subreddit_name: str) -> Dict:
+    """Fetch current subreddit stats from Reddit (blocking)"""
+    subreddit = api_clients.reddit_client.subreddit(subreddit_name)
+    return {"subscribers": subreddit.subscribers}
+
+def reddit_rate_limit_wait(requests_needed: int) -> float:
+    """Seconds to wait before making requests_needed more Reddit requests"""
+    limits = api_clients.reddit_client.auth.limits if api_clients.reddit_client else {}
+    remaining, reset_timestamp = limits.get("remaining"), limits.get("reset_timestamp")
+    if remaining is None or reset_timestamp is None or remaining >= requests_needed:
+        return 0
+    return max(0.0, reset_timestamp - time.time())
+
+def reddit_retry_after(error: Exception) -> Optional[float]:
+    """Retry delay for a Reddit 429, or None for other errors"""
+    if not isinstance(error, TooManyRequests):
+        return None
+    try:
+        return float(error.retry_after or 60)
+    except ValueError:
+        return 60.0
+
+metadata_refresher = MetadataRefresher(
+    subreddit_metadata.catalog,
+    fetch_subreddit_metadata,
+    reddit_pool,
+    batch_size=METADATA_REFRESH_BATCH_SIZE,
+    stale_after=METADATA_STALE_AFTER,
+    interval=METADATA_REFRESH_INTERVAL,
+    timeout=METADATA_FETCH_TIMEOUT,
+    ready=lambda: api_clients.reddit_client is not None,
+    rate_limit_wait=reddit_rate_limit_wait,
+    retry_after=reddit_retry_after,
+    on_refreshed=subreddit_metadata.rebuild_index
+)
+
+@app.on_event("startup")
+async def start_metadata_refresher():
+    await metadata_refresher.start()
+
+@app.on_event("shutdown")
+async def stop_metadata_refresher():
+    await metadata_refresher.stop()
+
 @app.post("/update-subreddit-metadata")
 async def update_subreddit_metadata():
-    """Update subreddit metadata from Reddit API"""
-    try:
-        subreddit_metadata.update_metadata_from_reddit()
-        return {"status": "success", "message": "Subreddit metadata updated successfully"}
-    except Exception as e:
-        print(f"Error updating subreddit metadata: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    """Start a background refresh of stale subreddit metadata"""
+    if not api_clients.reddit_client:
+        raise HTTPException(status_code=400, detail="Reddit client not configured")
+    started = metadata_refresher.trigger()
+    return {
+        "status": "started" if started else "running",
+        "message": "Subreddit metadata refresh started" if started else "Subreddit metadata refresh already running",
+        "refresh": metadata_refresher.status()
+    }
+
+@app.get("/subreddit-metadata-status")
+async def subreddit_metadata_status():
+    """Progress of the current or last subreddit metadata refresh"""
+    return {**metadata_refresher.status(), "catalogUpdated": subreddit_metadata.catalog.get_info("last_updated")}
 
 @app.get("/get-all-subreddits")
-async def get_all_subreddits():
-    """Get all available subreddits for manual selection"""
+async def get_all_subreddits(page: int = 1, page_size: int = SUBREDDIT_PAGE_SIZE, category: Optional[str] = None, sort: str = "subscribers"):
+    """Get one page of available subreddits for manual selection"""
+    if page < 1 or page_size < 1:
+        raise HTTPException(status_code=400, detail="page and page_size must be positive")
+    if sort not in SORT_ORDERS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(SORT_ORDERS)}")
     try:
-        all_subreddits = []
-        for subreddit_name, subreddit_data in subreddit_metadata.metadata["subreddits"].items():
-            all_subreddits.append({
-                "name": subreddit_name,
-                "display_name": subreddit_data["display_name"],
-                "category": subreddit_data["category"],
-                "subscribers": subreddit_data["subscribers"],
-                "activity_score": subreddit_data["activity_score"]
-            })
-        
-        # Sort by subscribers (most popular first)
-        all_subreddits.sort(key=lambda x: x["subscribers"], reverse=True)
-        return {"subreddits": all_subreddits}
+        page_size = min(page_size, SUBREDDIT_MAX_PAGE_SIZE)
+        # Sorted by subscribers (most popular first) by default, straight from the catalog index
+        rows, total = subreddit_metadata.catalog.list_page(
+            offset=(page - 1) * page_size, limit=page_size, sort=sort, category=category
+        )
+        all_subreddits = [
+            {
+                "name": row["name"],
+                "display_name": row["display_name"],
+                "category": row["category"],
+                "subscribers": row["subscribers"],
+                "activity_score": row["activity_score"]
+            }
+            for row in rows
+        ]
+        return {"subreddits": all_subreddits, "total": total, "page": page, "pageSize": page_size}
     except Exception as e:
         print(f"Error getting all subreddits: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Background jobs for long-running analysis pipelines
+class AnalysisJobInput(BaseModel):
+    niche: str
+    profile: dict = {}
+    selected_subreddits: List[str] = []
+    source: SearchSource = "live"
+
+class JobInput(BaseModel):
+    kind: str
+    payload: dict
+
+def select_top_pain_points(analysis, posts, limit=3):
+    """Pick the pain points to generate ideas from, the same way the UI does."""
+    pain_points = [
+        point for cluster in analysis.get("clusters", []) for point in cluster.get("painPoints") or []
+        if isinstance(point, dict)
+    ]
+    if pain_points:
+        pain_points.sort(key=lambda p: (p.get("emotionIntensity", 0) or 0) + (p.get("solutionGap", 0) or 0), reverse=True)
+        return pain_points[:limit]
+    # Fallback: use the posts themselves if no clusters were found
+    return [{
+        "point": post["title"],
+        "quote": post.get("content", "")[:200],
+        "emotionIntensity": 7,
+        "currentSolutions": [],
+        "solutionGap": 7
+    } for post in posts[:limit]]
+
+async def run_analysis_job(payload, report):
+    """Run search -> pain point analysis -> idea generation for one niche."""
+    job_input = AnalysisJobInput(**payload)
+    
+    report("search-reddit")
+    if job_input.selected_subreddits:
+        search_response = await search_reddit_targeted(
+            SubredditSearchInput(
+                query=job_input.niche,
+                selected_subreddits=job_input.selected_subreddits,
+                source=job_input.source
+            )
+        )
+        posts = search_response["redditPosts"]
+    else:
+        posts = await scrape_reddit(job_input.niche, job_input.source)
+    
+    report("process-pain-points")
+    contents = [post["content"] for post in posts if post.get("content")]
+    
+    async def on_part(index, total_parts, part_analysis):
+        report(f"process-pain-points ({index + 1}/{total_parts} parts)")
+    
+    analysis = await analyze_pain_points(contents, on_part)
+    
+    report("generate-ideas")
+    top_pain_points = select_top_pain_points(analysis, posts)
+    ideas_response = await generate_ideas(IdeasInput(painPoints=top_pain_points, profile=job_input.profile))
+    
+    return {"redditPosts": posts, "analysis": analysis, "ideas": ideas_response["ideas"]}
+
+def endpoint_job(endpoint, input_model):
+    """Wrap an endpoint so it can run as a background job with a dict payload."""
+    async def handler(payload, report):
+        report(endpoint.__name__)
+        return await endpoint(input_model(**payload))
+    return handler
+
+# Payload field carrying the submitting request's client key into the job
+JOB_CLIENT_KEY_FIELD = "clientKey"
+
+def with_job_clients(handler):
+    """Run a job handler with the API clients of the request that submitted it.
+
+    Its OpenAI calls use the gateway's batch lane, behind interactive requests.
+    Jobs whose client set is gone (evicted, or lost on restart) fail instead of
+    running with another user's credentials.
+    """
+    async def run(payload, report):
+        payload = dict(payload)
+        client_key = payload.pop(JOB_CLIENT_KEY_FIELD, None)
+        if client_key and client_key not in api_clients.registry:
+            raise HTTPException(status_code=401, detail="Client key expired. Please configure the API again and resubmit the job.")
+        token = current_client_key.set(client_key)
+        lane_token = current_lane.set(BATCH)
+        try:
+            return await handler(payload, report)
+        finally:
+            current_lane.reset(lane_token)
+            current_client_key.reset(token)
+    return run
+
+# Payload model per job kind, used to validate submissions up front
+JOB_INPUT_MODELS = {
+    "generate-niches": ProfileInput,
+    "validate-demand": NicheInput,
+    "validate-demand-batch": NicheBatchInput,
+    "search-reddit": NicheInput,
+    "search-reddit-targeted": SubredditSearchInput,
+    "process-pain-points": PainPointsInput,
+    "generate-ideas": IdeasInput,
+    "analysis": AnalysisJobInput,
+}
+
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+job_queue = JobQueue(
+    JobStore(os.getenv("JOB_STORE_FILE", "jobs.db")),
+    workers=int(os.getenv("JOB_WORKERS", "2")),
+    result_ttl=float(os.getenv("JOB_RESULT_TTL", str(7 * 24 * 3600)))
+)
+job_queue.register("generate-niches", with_job_clients(endpoint_job(generate_niches, ProfileInput)))
+job_queue.register("validate-demand", with_job_clients(endpoint_job(validate_demand, NicheInput)))
+job_queue.register("validate-demand-batch", with_job_clients(endpoint_job(validate_demand_batch, NicheBatchInput)))
+job_queue.register("search-reddit", with_job_clients(endpoint_job(search_reddit, NicheInput)))
+job_queue.register("search-reddit-targeted", with_job_clients(endpoint_job(search_reddit_targeted, SubredditSearchInput)))
+job_queue.register("process-pain-points", with_job_clients(endpoint_job(process_pain_points, PainPointsInput)))
+job_queue.register("generate-ideas", with_job_clients(endpoint_job(generate_ideas, IdeasInput)))
+job_queue.register("analysis", with_job_clients(run_analysis_job))
+
+@app.on_event("startup")
+async def start_job_queue():
+    await job_queue.start()
+
+@app.on_event("shutdown")
+async def stop_job_queue():
+    await job_queue.stop()
+
+def get_job_or_404(job_id):
+    job = job_queue.store.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+@app.post("/jobs")
+async def submit_job(input: JobInput):
+    """Submit a background job; identical in-flight jobs share one job ID"""
+    check_api_configuration()
+    input_model = JOB_INPUT_MODELS.get(input.kind)
+    if not input_model:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind '{input.kind}'. Valid kinds: {', '.join(JOB_INPUT_MODELS)}")
+    try:
+        payload = input_model(**input.payload).dict()
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if current_client_key.get():
+        payload[JOB_CLIENT_KEY_FIELD] = current_client_key.get()
+    job, created = job_queue.submit(input.kind, payload)
+    return {"jobId": job["jobId"], "status": job["status"], "deduplicated": not created}
+
+@app.get("/jobs")
+async def get_job_queue_stats():
+    """Get worker count, queue depth and job counts by status"""
+    return job_queue.stats()
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get a job's status and progress (and its result once finished)"""
+    job = get_job_or_404(job_id)
+    job.pop("payload", None)
+    return job
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    """Get a finished job's result"""
+    job = get_job_or_404(job_id)
+    if job["status"] == FAILED:
+        raise HTTPException(status_code=500, detail=job["error"])
+    if job["status"] != COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return job["result"]
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """Stream a job's status changes as server-sent events, ending with a "result" event"""
+    get_job_or_404(job_id)
+    
+    async def produce(emit):
+        last_state = None
+        while True:
+            job = get_job_or_404(job_id)
+            state = (job["status"], job["progress"])
+            if state != last_state:
+                await emit("status", {"jobId": job_id, "status": job["status"], "progress": job["progress"]})
+                last_state = state
+            if job["status"] in FINISHED_STATUSES:
+                job.pop("payload", None)
+                await emit("result", job)
+                return
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+    
+    return sse_response(produce)
+
+@app.get("/indicator-stats")
+async def indicator_stats():
+    """Get per-indicator hit counts for the post filters"""
+    return {"matchers": [matcher.stats() for matcher in (business_matcher, problem_matcher, help_matcher)]}
+
+@app.get("/llm-stats")
+async def llm_stats():
+    """Get LLM gateway queue, budget and rate-limit counters"""
+    return llm_gateway.stats()
+
+@app.get("/client-stats")
+async def client_stats():
+    """Get API client reuse counters"""
+    return {**api_clients.registry.stats(), "http2": OPENAI_HTTP2}
+
+@app.get("/cache-stats")
+async def cache_stats():
+    """Get hit/miss counters and sizes for the backend caches"""
+    stats = {"searchCache": search_cache.stats()}
+    if llm_cache:
+        stats["llmCache"] = llm_cache.stats()
+    stats["trends"] = {**trends_service.stats(), "pool": trends_pool.stats()}
+    stats["corpus"] = {**await corpus_pool.run(post_corpus.stats), "pool": corpus_pool.stats()}
+    return stats
@@ -0,0 +1,159 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from subreddit_catalog import SubredditCatalog
+from workers import WorkerPool
+
+
+class MetadataRefresher:
+    """Refreshes stale subreddit catalog rows in the background.
+
+    Stale subreddits are fetched concurrently in batches on the worker pool
+    and each result is committed as soon as it arrives, so a failure or
+    restart keeps the progress made so far. Before each batch
+    `rate_limit_wait()` may ask for a pause, and a rate-limited fetch (one
+    `retry_after(exc)` returns a delay for) is retried after that delay.
+    """
+
+    def __init__(
+        self,
+        catalog: SubredditCatalog,
+        fetch: Callable[[str], Dict],
+        pool: WorkerPool,
+        batch_size: int = 8,
+        stale_after: float = 86400,
+        interval: float = 0,
+        timeout: Optional[float] = None,
+        ready: Optional[Callable[[], bool]] = None,
+        rate_limit_wait: Optional[Callable[[int], float]] = None,
+        retry_after: Optional[Callable[[Exception], Optional[float]]] = None,
+        max_rate_limit_waits: int = 5,
+        on_refreshed: Optional[Callable[[], None]] = None,
+    ):
+        self.catalog = catalog
+        self.fetch = fetch
+        self.pool = pool
+        self.batch_size = max(1, batch_size)
+        self.stale_after = stale_after
+        self.interval = interval
+        self.timeout = timeout
+        self.ready = ready
+        self.rate_limit_wait = rate_limit_wait
+        self.retry_after = retry_after
+        self.max_rate_limit_waits = max_rate_limit_waits
+        self.on_refreshed = on_refreshed
+        self._run_task: Optional[asyncio.Task] = None
+        self._schedule_task: Optional[asyncio.Task] = None
+        self._status: Dict = {
+            "lastStarted": None,
+            "lastFinished": None,
+            "stale": 0,
+            "refreshed": 0,
+            "failed": 0,
+            "remaining": 0,
+            "rateLimitWaits": 0,
+            "lastError": None,
+        }
+
+    def status(self) -> Dict:
+        return {"running": self.running, **self._status, "staleAfter": self.stale_after, "interval": self.interval, "batchSize": self.batch_size}
+
+    @property
+    def running(self) -> bool:
+        return self._run_task is not None and not self._run_task.done()
+
+    def trigger(self) -> bool:
+        """Start a refresh unless one is already running; returns True if started"""
+        if self.running:
+            return False
+        self._run_task = asyncio.create_task(self.run_once())
+        return True
+
+    async def start(self):
+        """Schedule a refresh every `interval` seconds (0 disables scheduling)"""
+        if self.interval > 0:
+            self._schedule_task = asyncio.create_task(self._schedule())
+
+    async def stop(self):
+        tasks = [task for task in (self._schedule_task, self._run_task) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._schedule_task = None
+        self._run_task = None
+
+    async def _schedule(self):
+        while True:
+            self.trigger()
+            await asyncio.sleep(self.interval)
+
+    async def _fetch(self, name: str):
+        return await self.pool.run(self.fetch, name, timeout=self.timeout)
+
+    async def run_once(self) -> Dict:
+        """Refresh every subreddit older than the staleness threshold"""
+        if self.ready is not None and not self.ready():
+            print("Reddit client not configured, skipping metadata refresh")
+            return self.status()
+
+        cutoff = (datetime.now() - timedelta(seconds=self.stale_after)).isoformat()
+        pending: List[str] = self.catalog.stale(cutoff)
+        self._status.update({
+            "lastStarted": datetime.now().isoformat(),
+            "stale": len(pending),
+            "refreshed": 0,
+            "failed": 0,
+            "remaining": len(pending),
+            "rateLimitWaits": 0,
+            "lastError": None,
+        })
+        try:
+            while pending:
+                if self.rate_limit_wait is not None:
+                    wait = self.rate_limit_wait(min(self.batch_size, len(pending)))
+                    if wait > 0:
+                        await self._wait_for_rate_limit(wait)
+
+                batch, pending = pending[:self.batch_size], pending[self.batch_size:]
+                results = await asyncio.gather(*(self._fetch(name) for name in batch), return_exceptions=True)
+
+                limited: List[str] = []
+                wait = 0.0
+                for name, result in zip(batch, results):
+                    if isinstance(result, Exception):
+                        delay = self.retry_after(result) if self.retry_after is not None else None
+                        if delay is not None:
+                            limited.append(name)
+                            wait = max(wait, delay)
+                            continue
+                        self._status["failed"] += 1
+                        self._status["lastError"] = f"r/{name}: {result}"
+                        print(f"Error refreshing r/{name}: {result}")
+                        continue
+                    self.catalog.update_fields(name, **result, last_updated=datetime.now().isoformat())
+                    self._status["refreshed"] += 1
+
+                if limited:
+                    # Retry rate-limited subreddits first once the limit resets
+                    pending = limited + pending
+                    await self._wait_for_rate_limit(wait)
+                self._status["remaining"] = len(pending)
+
+            self.catalog.set_info("last_updated", datetime.now().isoformat())
+            print(f"Subreddit metadata refreshed: {self._status['refreshed']} updated, {self._status['failed']} failed")
+        except Exception as e:
+            self._status["lastError"] = str(e)
+            print(f"Error refreshing subreddit metadata: {e}")
+        finally:
+            self._status["lastFinished"] = datetime.now().isoformat()
+            if self._status["refreshed"] and self.on_refreshed is not None:
+                self.on_refreshed()
+        return self.status()
+
+    async def _wait_for_rate_limit(self, seconds: float):
+        if self._status["rateLimitWaits"] >= self.max_rate_limit_waits:
+            raise RuntimeError(f"Rate limited {self._status['rateLimitWaits']} times, stopping until the next refresh")
+        self._status["rateLimitWaits"] += 1
+        print(f"Reddit rate limit reached, pausing metadata refresh for {seconds:.1f}s")
+        await asyncio.sleep(seconds)
@@ -0,0 +1,137 @@
+"""Local stand-in for the OpenAI chat completions API, for offline testing.
+
+Run it and point the backend at it:
+
+    python mock_openai_server.py --port 8001 --latency 0.5 --rate-limit-every 5
+    OPENAI_BASE_URL=http://localhost:8001/v1 uvicorn main:app
+
+Responses are canned JSON shaped like what each IdeaSpark prompt asks for
+(niches, pain point clusters or ideas). Every Nth request can be answered
+with a 429 to exercise the backend's rate-limit handling.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+app = FastAPI()
+settings = {"latency": 0.0, "rate_limit_every": 0, "retry_after": 1}
+request_counter = itertools.count(1)
+
+
+def mock_content(prompt: str) -> str:
+    """Canned answer in the format the prompt asks for"""
+    if "JSON array of ideas" in prompt:
+        return json.dumps([
+            {
+                "name": "FocusFlow",
+                "description": "Plans each day around the client work that pays the most",
+                "targetAudience": "Freelance developers",
+                "valueProposition": "Less time planning, more billable hours",
+                "uniqueMechanism": "Learns from invoices which tasks matter",
+                "monetization": "Monthly subscription",
+                "resonanceScore": 82,
+                "keyFeatures": ["Daily plan", "Invoice sync", "Focus timer"],
+                "marketTrends": ["Freelance growth", "AI assistants"],
+                "competition": {"existingSolutions": ["Todoist"], "ourAdvantage": "Revenue-aware planning"}
+            }
+        ])
+    if '"clusters"' in prompt:
+        return json.dumps({
+            "clusters": [
+                {
+                    "name": "Time Management",
+                    "themes": ["scheduling", "procrastination"],
+                    "quotes": ["I never know what to work on first"],
+                    "emotionIntensity": 7.5,
+                    "solutionGap": 6.5,
+                    "frequency": 3,
+                    "painPoints": [
+                        {
+                            "point": "Prioritizing tasks",
+                            "quote": "I never know what to work on first",
+                            "emotionIntensity": 8,
+                            "currentSolutions": ["To-do lists"],
+                            "solutionGap": 7
+                        }
+                    ]
+                }
+            ]
+        })
+    if "market niches" in prompt:
+        return json.dumps([
+            {"name": f"Mock niche {i}", "description": "A niche from the mock OpenAI server"} for i in range(1, 6)
+        ])
+    return "OK"
+
+
+def usage_for(prompt: str, content: str) -> dict:
+    prompt_tokens = len(prompt) // 4
+    completion_tokens = len(content) // 4
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens}
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    number = next(request_counter)
+    if settings["rate_limit_every"] and number % settings["rate_limit_every"] == 0:
+        return JSONResponse(
+            status_code=429,
+            headers={"retry-after": str(settings["retry_after"])},
+            content={"error": {"message": "Rate limit reached (mock)", "type": "requests", "code": "rate_limit_exceeded"}}
+        )
+    await asyncio.sleep(settings["latency"])
+
+    prompt = "\n".join(message.get("content", "") for message in body.get("messages", []))
+    content = mock_content(prompt)
+    model = body.get("model", "gpt-4")
+    completion_id = f"chatcmpl-mock-{number}"
+    created = int(time.time())
+
+    if not body.get("stream"):
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": usage_for(prompt, content),
+        }
+
+    include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+
+    async def events():
+        def chunk(choices, usage=None):
+            data = {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                    "model": model, "choices": choices}
+            if include_usage:
+                data["usage"] = usage
+            return f"data: {json.dumps(data)}\n\n"
+
+        for start in range(0, len(content), 16):
+            yield chunk([{"index": 0, "delta": {"content": content[start:start + 16]}, "finish_reason": None}])
+            await asyncio.sleep(0.01)
+        yield chunk([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        if include_usage:
+            yield chunk([], usage_for(prompt, content))
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock OpenAI chat completions server")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before answering")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Answer every Nth request with a 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429s")
+    args = parser.parse_args()
+    settings.update(latency=args.latency, rate_limit_every=args.rate_limit_every, retry_after=args.retry_after)
+    uvicorn.run(app, host="127.0.0.1", port=args.port)
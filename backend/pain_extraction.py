@@ -0,0 +1,140 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+from chunker import count_tokens
+from indicators import KeywordMatcher, problem_matcher
+
+COMMENTS_DIVIDER = "\n\n--- COMMENTS ---\n"
+COMMENT_HEADER = re.compile(r"\nComment by (.+?) \(score: (-?\d+)\):\n")
+
+# First person followed closely by a struggle, e.g. "I keep failing to", "we can't figure out"
+STRUGGLE_PATTERN = re.compile(
+    r"\b(?:i|i'm|im|i've|i'd|we|we're|my|our)\b[^.!?]{0,40}?"
+    r"\b(?:struggl\w*|stuck|can't|cannot|couldn't|unable|fail\w*|hate|lost|overwhelm\w*|frustrat\w*|"
+    r"tired of|sick of|waste\w*|confus\w*|worr\w*|afraid|anxious|burn(?:ed|t)? out|give up|gave up|"
+    r"no idea|don't know|keep \w+ing)\b",
+    re.IGNORECASE,
+)
+
+# Words of negative sentiment; each occurrence adds to a sentence's score
+NEGATIVE_WORDS = {
+    "annoying", "awful", "broken", "bug", "bugs", "costly", "difficult", "disaster", "exhausting",
+    "expensive", "frustrating", "hard", "headache", "horrible", "impossible", "issue", "issues",
+    "mess", "messy", "nightmare", "pain", "painful", "problem", "problems", "slow", "stress",
+    "stressful", "struggle", "terrible", "tedious", "time-consuming", "tough", "ugh", "unreliable",
+    "useless", "worst",
+}
+
+BOILERPLATE = re.compile(r"^(?:\[deleted\]|\[removed\]|https?://\S+|thanks?(?: you)?(?: in advance)?[.!]*|tl;?dr:?)$",
+                         re.IGNORECASE)
+
+# Sentences need at least this score to be selected
+MIN_SCORE = 1.0
+
+# Separate matcher so extraction scans do not show up in /indicator-stats
+pain_matcher = KeywordMatcher("pain-sentences", problem_matcher.patterns)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences on terminal punctuation and line breaks, dropping boilerplate"""
+    sentences = []
+    for sentence in re.split(r"(?<=[.!?])\s+|\n+", text):
+        sentence = sentence.strip()
+        if len(sentence) > 2 and not BOILERPLATE.match(sentence):
+            sentences.append(sentence)
+    return sentences
+
+
+def join_sentences(sentences: List[str]) -> str:
+    """Join sentences with spaces, starting a new line after one without end punctuation.
+
+    Title and heading lines rarely end in punctuation; on their own line they
+    stay separate sentences instead of running into the sentence after them.
+    """
+    text = ""
+    for sentence in sentences:
+        if text:
+            text += " " if text[-1] in ".!?" else "\n"
+        text += sentence
+    return text
+
+
+def score_sentence(sentence: str) -> float:
+    """Pain signal of a sentence: problem indicators, first-person struggles and negative words"""
+    words = re.findall(r"[a-z'-]+", sentence.lower())
+    return (2.0 * len(pain_matcher.find_all(sentence))
+            + 2.0 * len(STRUGGLE_PATTERN.findall(sentence))
+            + sum(1.0 for word in words if word in NEGATIVE_WORDS))
+
+
+def _segments(content: str) -> List[Tuple[Optional[str], str]]:
+    """Split post content into (comment header or None for the post body, text)"""
+    body, _, comments = content.partition(COMMENTS_DIVIDER)
+    segments = [(None, body)]
+    if comments:
+        parts = COMMENT_HEADER.split("\n" + comments)
+        # parts = [text before the first header, author, score, text, author, score, text, ...]
+        for i in range(1, len(parts) - 2, 3):
+            segments.append((f"Comment by {parts[i]} (score: {parts[i + 1]}):", parts[i + 2]))
+    return segments
+
+
+def extract_post(content: str, max_sentences: int = 10, context: int = 0) -> Tuple[str, int, int]:
+    """Keep the highest-scoring pain sentences of one post plus some context.
+
+    The opening sentence of the post is always kept, as is up to `context`
+    sentences before each selected one. Posts without any pain signal keep
+    their first two sentences. Returns (extracted text, sentences, kept).
+    """
+    segments = [(header, split_sentences(text)) for header, text in _segments(content)]
+    flat = [(s, j) for s, (_, sentences) in enumerate(segments) for j in range(len(sentences))]
+    if not flat:
+        return "", 0, 0
+
+    scores = {(s, j): score_sentence(segments[s][1][j]) for s, j in flat}
+    ranked = sorted((key for key in flat if scores[key] >= MIN_SCORE), key=lambda key: -scores[key])[:max_sentences]
+    keep = set()
+    for s, j in ranked:
+        keep.update((s, i) for i in range(max(0, j - context), j + 1))
+    if segments[0][1]:
+        keep.add((0, 0))
+    if not ranked:
+        keep.update((0, j) for j in range(min(2, len(segments[0][1]))))
+
+    body = join_sentences([sentence for j, sentence in enumerate(segments[0][1]) if (0, j) in keep])
+    comments = [
+        f"{header}\n" + join_sentences([sentence for j, sentence in enumerate(sentences) if (s, j) in keep])
+        for s, (header, sentences) in enumerate(segments[1:], start=1)
+        if any((s, j) in keep for j in range(len(sentences)))
+    ]
+    text = body + (COMMENTS_DIVIDER + "\n" + "\n\n".join(comments) if comments else "")
+    return text.strip(), len(flat), len(keep)
+
+
+def extract_pain_content(contents: List[str], model: str = "gpt-4", max_sentences: int = 10,
+                         context: int = 0) -> Tuple[List[str], Dict]:
+    """Shrink posts to their pain sentences before LLM analysis.
+
+    Returns the extracted posts (empty ones dropped) and a report of how
+    much was removed.
+    """
+    extracted, sentences, kept = [], 0, 0
+    for content in contents:
+        text, post_sentences, post_kept = extract_post(content, max_sentences, context)
+        sentences += post_sentences
+        kept += post_kept
+        if text:
+            extracted.append(text)
+
+    tokens_before = sum(count_tokens(content, model) for content in contents)
+    tokens_after = sum(count_tokens(text, model) for text in extracted)
+    report = {
+        "posts": len(contents),
+        "postsKept": len(extracted),
+        "sentences": sentences,
+        "sentencesKept": kept,
+        "tokensBefore": tokens_before,
+        "tokensAfter": tokens_after,
+        "tokenReduction": round(1 - tokens_after / tokens_before, 3) if tokens_before else 0.0,
+    }
+    return extracted, report
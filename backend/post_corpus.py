@@ -0,0 +1,295 @@
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Words left out of full-text queries so "time management for freelancers"
+# does not require "for" to appear in every post
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "i", "in", "is",
+    "it", "my", "of", "on", "or", "the", "to", "what", "with",
+}
+
+POST_COLUMNS = ("id", "subreddit", "title", "selftext", "url", "score", "num_comments", "created_utc")
+
+
+def fts_query(text: str) -> Optional[str]:
+    """FTS5 query requiring every significant word of text (None if there are none)"""
+    terms = [term for term in re.findall(r"\w+", text.lower()) if term not in STOPWORDS]
+    if not terms:
+        return None
+    return " AND ".join(f'"{term}"' for term in dict.fromkeys(terms))
+
+
+class PostCorpus:
+    """Persistent SQLite store of Reddit posts and top comments with an FTS5 index.
+
+    Posts are keyed by submission ID, so repeated fetches update scores in
+    place. Ingest state per search scope (query + subreddit) records when it
+    was last fetched from Reddit, the newest post seen and which posts Reddit
+    returned, so later searches can serve those posts and only need to fetch
+    newer ones.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS posts (
+                id TEXT PRIMARY KEY,
+                subreddit TEXT NOT NULL,
+                title TEXT NOT NULL,
+                selftext TEXT NOT NULL DEFAULT '',
+                url TEXT,
+                score INTEGER NOT NULL DEFAULT 0,
+                num_comments INTEGER NOT NULL DEFAULT 0,
+                created_utc REAL NOT NULL,
+                source TEXT NOT NULL DEFAULT 'reddit',
+                ingested_at REAL NOT NULL,
+                comments_fetched_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_posts_subreddit_created ON posts(subreddit COLLATE NOCASE, created_utc);
+            CREATE INDEX IF NOT EXISTS idx_posts_created ON posts(created_utc);
+            CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+                title, selftext, content='posts', content_rowid='rowid'
+            );
+            CREATE TRIGGER IF NOT EXISTS posts_ai AFTER INSERT ON posts BEGIN
+                INSERT INTO posts_fts(rowid, title, selftext) VALUES (new.rowid, new.title, new.selftext);
+            END;
+            CREATE TRIGGER IF NOT EXISTS posts_ad AFTER DELETE ON posts BEGIN
+                INSERT INTO posts_fts(posts_fts, rowid, title, selftext) VALUES ('delete', old.rowid, old.title, old.selftext);
+            END;
+            CREATE TRIGGER IF NOT EXISTS posts_au AFTER UPDATE OF title, selftext ON posts BEGIN
+                INSERT INTO posts_fts(posts_fts, rowid, title, selftext) VALUES ('delete', old.rowid, old.title, old.selftext);
+                INSERT INTO posts_fts(rowid, title, selftext) VALUES (new.rowid, new.title, new.selftext);
+            END;
+            CREATE TABLE IF NOT EXISTS comments (
+                post_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                author TEXT,
+                score INTEGER NOT NULL DEFAULT 0,
+                text TEXT NOT NULL,
+                comment_id TEXT,
+                PRIMARY KEY (post_id, position)
+            );
+            CREATE TABLE IF NOT EXISTS ingest_state (
+                scope TEXT PRIMARY KEY,
+                last_ingest REAL NOT NULL,
+                newest_created REAL
+            );
+            CREATE TABLE IF NOT EXISTS scope_posts (
+                scope TEXT NOT NULL,
+                post_id TEXT NOT NULL,
+                UNIQUE (scope, post_id)
+            );
+            """
+        )
+        # Corpora created before comment IDs were stored
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(comments)")}
+        if "comment_id" not in columns:
+            self._conn.execute("ALTER TABLE comments ADD COLUMN comment_id TEXT")
+        # Live comments have no ID (NULLs never collide); dump comments are stored once
+        self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_comments_id ON comments(post_id, comment_id)")
+        self._conn.commit()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict:
+        return {column: row[column] for column in POST_COLUMNS}
+
+    def add_posts(self, posts: Iterable[Dict], source: str = "reddit") -> int:
+        """Insert or update posts (dicts with POST_COLUMNS); returns how many were written"""
+        now = time.time()
+        rows = [
+            (
+                post["id"], post["subreddit"], post["title"], post.get("selftext") or "", post.get("url"),
+                int(post.get("score") or 0), int(post.get("num_comments") or 0), float(post["created_utc"]),
+                source, now,
+            )
+            for post in posts
+        ]
+        if not rows:
+            return 0
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    """
+                    INSERT INTO posts (id, subreddit, title, selftext, url, score, num_comments, created_utc, source, ingested_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        title = excluded.title,
+                        selftext = excluded.selftext,
+                        score = excluded.score,
+                        num_comments = excluded.num_comments,
+                        ingested_at = excluded.ingested_at
+                    """,
+                    rows,
+                )
+        return len(rows)
+
+    def set_comments(self, post_id: str, comments: List[Dict]):
+        """Replace the stored top comments of a post"""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM comments WHERE post_id = ?", (post_id,))
+                self._conn.executemany(
+                    "INSERT INTO comments (post_id, position, author, score, text) VALUES (?, ?, ?, ?, ?)",
+                    [(post_id, i, c.get("author"), int(c.get("score") or 0), c["text"]) for i, c in enumerate(comments)],
+                )
+                self._conn.execute("UPDATE posts SET comments_fetched_at = ? WHERE id = ?", (time.time(), post_id))
+
+    def merge_comments(self, comments_by_post: Dict[str, List[Dict]], keep: int = 10) -> Tuple[int, int]:
+        """Add comments (dicts with an "id") to stored posts, keeping each post's `keep` highest-scored.
+
+        Comments already stored and comments of posts that are not in the
+        corpus are skipped, so re-running an ingest does not duplicate them.
+        The comments' fetch time is left alone: merged comments may be old
+        and should not stop live comments from being fetched. Returns
+        (posts updated, new comments stored).
+        """
+        posts_updated = comments_stored = 0
+        with self._lock:
+            with self._conn:
+                for post_id, new_comments in comments_by_post.items():
+                    if self._conn.execute("SELECT 1 FROM posts WHERE id = ?", (post_id,)).fetchone() is None:
+                        continue
+                    existing = [
+                        {"id": row["comment_id"], "author": row["author"], "score": row["score"], "text": row["text"]}
+                        for row in self._conn.execute("SELECT * FROM comments WHERE post_id = ?", (post_id,))
+                    ]
+                    seen = {comment["id"] for comment in existing if comment["id"] is not None}
+                    added = []
+                    for comment in new_comments:
+                        if comment["id"] not in seen:
+                            seen.add(comment["id"])
+                            added.append(comment)
+                    if not added:
+                        continue
+                    merged = sorted(existing + added, key=lambda c: int(c.get("score") or 0), reverse=True)[:keep]
+                    self._conn.execute("DELETE FROM comments WHERE post_id = ?", (post_id,))
+                    self._conn.executemany(
+                        "INSERT INTO comments (post_id, position, author, score, text, comment_id) VALUES (?, ?, ?, ?, ?, ?)",
+                        [(post_id, i, c.get("author"), int(c.get("score") or 0), c["text"], c.get("id"))
+                         for i, c in enumerate(merged)],
+                    )
+                    stored = sum(1 for comment in merged if any(comment is new for new in added))
+                    if stored:
+                        posts_updated += 1
+                        comments_stored += stored
+        return posts_updated, comments_stored
+
+    def get_comments(self, post_ids: List[str], fetched_after: Optional[float] = None) -> Dict[str, List[Dict]]:
+        """Stored comments for posts whose comments were fetched after a timestamp.
+
+        With fetched_after=None any stored comments are returned, including
+        comments merged from dumps, which have no fetch time.
+        """
+        if not post_ids:
+            return {}
+        placeholders = ", ".join("?" for _ in post_ids)
+        if fetched_after is None:
+            condition, params = "(comments_fetched_at IS NOT NULL OR id IN (SELECT post_id FROM comments))", ()
+        else:
+            condition, params = "comments_fetched_at > ?", (fetched_after,)
+        with self._lock:
+            fresh = [
+                row[0] for row in self._conn.execute(
+                    f"SELECT id FROM posts WHERE id IN ({placeholders}) AND {condition}",
+                    (*post_ids, *params),
+                )
+            ]
+            rows = self._conn.execute(
+                f"SELECT * FROM comments WHERE post_id IN ({', '.join('?' for _ in fresh)}) ORDER BY post_id, position",
+                fresh,
+            ).fetchall() if fresh else []
+        comments: Dict[str, List[Dict]] = {post_id: [] for post_id in fresh}
+        for row in rows:
+            comments[row["post_id"]].append({"text": row["text"], "score": row["score"], "author": row["author"]})
+        return comments
+
+    def search(self, query: str, subreddits: Optional[List[str]] = None, since: Optional[float] = None,
+               limit: int = 100, candidates: int = 2000) -> List[Dict]:
+        """Posts matching every significant query word, best full-text match first.
+
+        Only the `candidates` most recently ingested matches are ranked, so the
+        bm25 sort stays bounded however many posts a common query matches.
+        """
+        match = fts_query(query)
+        if match is None:
+            return []
+        conditions, params = ["posts_fts MATCH ?"], [match]
+        if subreddits:
+            conditions.append(f"posts.subreddit COLLATE NOCASE IN ({', '.join('?' for _ in subreddits)})")
+            params.extend(subreddits)
+        if since is not None:
+            conditions.append("posts.created_utc >= ?")
+            params.append(since)
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT posts.* FROM (
+                    SELECT posts_fts.rowid AS rowid, bm25(posts_fts) AS rank
+                    FROM posts_fts JOIN posts ON posts.rowid = posts_fts.rowid
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY posts_fts.rowid DESC LIMIT ?
+                ) AS matches JOIN posts ON posts.rowid = matches.rowid
+                ORDER BY matches.rank LIMIT ?
+                """,
+                (*params, max(candidates, limit), limit),
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def ingest_state(self, scope: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM ingest_state WHERE scope = ?", (scope,)).fetchone()
+        return {"lastIngest": row["last_ingest"], "newestCreated": row["newest_created"]} if row else None
+
+    def scope_posts(self, scope: str, since: Optional[float] = None, limit: int = 100) -> List[Dict]:
+        """Posts Reddit returned for a scope, in the order they were ingested"""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT posts.* FROM scope_posts JOIN posts ON posts.id = scope_posts.post_id
+                WHERE scope_posts.scope = ? AND posts.created_utc >= ?
+                ORDER BY scope_posts.rowid LIMIT ?
+                """,
+                (scope, since if since is not None else float("-inf"), limit),
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def record_ingest(self, scope: str, newest_created: Optional[float], post_ids: Iterable[str] = ()):
+        """Remember that a scope was just fetched, keeping the newest post time seen and the posts returned"""
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO scope_posts (scope, post_id) VALUES (?, ?)",
+                    [(scope, post_id) for post_id in post_ids],
+                )
+                self._conn.execute(
+                    """
+                    INSERT INTO ingest_state (scope, last_ingest, newest_created) VALUES (?, ?, ?)
+                    ON CONFLICT(scope) DO UPDATE SET
+                        last_ingest = excluded.last_ingest,
+                        newest_created = MAX(COALESCE(ingest_state.newest_created, 0), COALESCE(excluded.newest_created, 0))
+                    """,
+                    (scope, time.time(), newest_created),
+                )
+
+    def version(self) -> str:
+        """Token that changes whenever posts or comments are added, including by other processes (dump ingests)"""
+        with self._lock:
+            posts = self._conn.execute("SELECT MAX(rowid) FROM posts").fetchone()[0] or 0
+            comments = self._conn.execute("SELECT MAX(rowid) FROM comments").fetchone()[0] or 0
+        return f"{posts}.{comments}"
+
+    def stats(self) -> Dict:
+        with self._lock:
+            posts = self._conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+            comments = self._conn.execute("SELECT COUNT(*) FROM comments").fetchone()[0]
+            scopes = self._conn.execute("SELECT COUNT(*) FROM ingest_state").fetchone()[0]
+            sources = dict(self._conn.execute("SELECT source, COUNT(*) FROM posts GROUP BY source").fetchall())
+        return {"posts": posts, "comments": comments, "searchScopes": scopes, "postsBySource": sources}
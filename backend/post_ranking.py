@@ -0,0 +1,98 @@
+import re
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from post_corpus import STOPWORDS
+
+# Weights of the ranking components (each scaled to 0-1)
+DEFAULT_WEIGHTS = {
+    "relevance": 0.5,    # TF-IDF cosine similarity of title + text to the query
+    "recency": 0.15,     # exponential decay with post age
+    "engagement": 0.2,   # log score and comment count, relative to the batch
+    "problem": 0.15,     # problem indicators per word, relative to the batch
+}
+
+# Age at which the recency component has halved
+DEFAULT_HALF_LIFE_DAYS = 90.0
+
+_EPS = 1e-9
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return [token for token in re.findall(r"[a-z0-9']+", (text or "").lower()) if token not in STOPWORDS]
+
+
+def tfidf_similarity(query: str, documents: Sequence[str]) -> np.ndarray:
+    """Cosine similarity between the query and each document under TF-IDF weighting.
+
+    The term matrix is kept as (document, term, count) triples, so memory
+    grows with the text length rather than documents x vocabulary.
+    """
+    n = len(documents)
+    vocabulary: Dict[str, int] = {}
+    rows, cols = [], []
+    for i, document in enumerate(documents):
+        for token in tokenize(document):
+            rows.append(i)
+            cols.append(vocabulary.setdefault(token, len(vocabulary)))
+    query_terms = [vocabulary[token] for token in set(tokenize(query)) if token in vocabulary]
+    if not query_terms:
+        return np.zeros(n)
+
+    size = len(vocabulary)
+    pairs, counts = np.unique(np.array(rows, dtype=np.int64) * size + np.array(cols, dtype=np.int64),
+                              return_counts=True)
+    doc_index, term_index = pairs // size, pairs % size
+    document_frequency = np.bincount(term_index, minlength=size)
+    idf = np.log((1 + n) / (1 + document_frequency)) + 1
+    values = (1 + np.log(counts)) * idf[term_index]  # sublinear term frequency
+
+    query_vector = np.zeros(size)
+    query_vector[query_terms] = idf[query_terms]
+    query_vector /= np.linalg.norm(query_vector)
+
+    norms = np.sqrt(np.bincount(doc_index, weights=values ** 2, minlength=n))
+    dots = np.bincount(doc_index, weights=values * query_vector[term_index], minlength=n)
+    return dots / np.maximum(norms, _EPS)
+
+
+def score_posts(query: str, posts: Sequence[Dict], indicator_counts: Sequence[int],
+                weights: Optional[Dict[str, float]] = None, half_life_days: float = DEFAULT_HALF_LIFE_DAYS,
+                now: Optional[float] = None) -> Dict[str, np.ndarray]:
+    """Ranking components and composite score (0-100) for a batch of posts.
+
+    posts are dicts with title, selftext, score, num_comments and created_utc;
+    indicator_counts holds the number of problem indicators found in each.
+    """
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    now = time.time() if now is None else now
+    texts = [f"{post['title']}\n{post.get('selftext') or ''}" for post in posts]
+
+    age_days = np.maximum(now - np.array([post.get("created_utc") or now for post in posts], dtype=float), 0) / 86400
+    engagement = (np.log1p(np.maximum(np.array([post.get("score") or 0 for post in posts], dtype=float), 0))
+                  + np.log1p(np.array([post.get("num_comments") or 0 for post in posts], dtype=float)))
+    words = np.array([max(len(text.split()), 1) for text in texts], dtype=float)
+    density = np.asarray(indicator_counts, dtype=float) / words
+
+    components = {
+        "relevance": tfidf_similarity(query, texts),
+        "recency": 0.5 ** (age_days / max(half_life_days, _EPS)),
+        "engagement": engagement / max(engagement.max(), _EPS),
+        "problem": density / max(density.max(), _EPS),
+    }
+    total_weight = sum(weights.get(name, 0) for name in components) or 1.0
+    score = 100 * sum(weights.get(name, 0) * component for name, component in components.items()) / total_weight
+    return {**components, "score": score}
+
+
+def rank_posts(query: str, posts: Sequence[Dict], indicator_counts: Sequence[int],
+               weights: Optional[Dict[str, float]] = None,
+               half_life_days: float = DEFAULT_HALF_LIFE_DAYS) -> List[int]:
+    """Indices of posts from best to worst composite score"""
+    if not posts:
+        return []
+    score = score_posts(query, posts, indicator_counts, weights, half_life_days)["score"]
+    # Stable sort keeps the incoming order (Reddit's relevance) for ties
+    return [int(i) for i in np.argsort(-score, kind="stable")]
@@ -0,0 +1,56 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+Emit = Callable[[str, Any], Awaitable[None]]
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # Keep reverse proxies from buffering the stream
+}
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one server-sent event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def sse_response(produce: Callable[[Emit], Awaitable[None]]) -> StreamingResponse:
+    """Stream the events a producer emits as a text/event-stream response.
+
+    produce(emit) runs as a background task and calls `await emit(event, data)`
+    for each event. If it raises, an "error" event with the failure detail is
+    sent before the stream closes. The task is cancelled if the client
+    disconnects.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def emit(event: str, data: Any):
+        await queue.put(sse_event(event, data))
+
+    async def run():
+        try:
+            await produce(emit)
+        except HTTPException as e:
+            await emit("error", {"status": e.status_code, "detail": e.detail})
+        except Exception as e:
+            print(f"Streaming error: {str(e)}")
+            await emit("error", {"status": 500, "detail": str(e)})
+        finally:
+            await queue.put(None)
+
+    async def events():
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            task.cancel()
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
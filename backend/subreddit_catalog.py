@@ -0,0 +1,162 @@
+import json
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Sort orders accepted by list_page, mapped to indexed ORDER BY clauses
+SORT_ORDERS = {
+    "subscribers": "subscribers DESC, position ASC",
+    "activity_score": "activity_score DESC, position ASC",
+    "name": "name ASC",
+}
+
+
+class SubredditCatalog:
+    """SQLite-backed subreddit catalog with indexed columns and atomic updates.
+
+    Every write is its own transaction, so concurrent metadata updates
+    cannot leave the catalog half-written the way rewriting one JSON file
+    could.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS subreddits (
+                name TEXT PRIMARY KEY,
+                position INTEGER NOT NULL,
+                display_name TEXT NOT NULL,
+                subscribers INTEGER NOT NULL DEFAULT 0,
+                category TEXT NOT NULL DEFAULT '',
+                topics TEXT NOT NULL DEFAULT '[]',
+                activity_score REAL NOT NULL DEFAULT 0,
+                last_updated TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_subreddits_category ON subreddits(category, subscribers DESC);
+            CREATE INDEX IF NOT EXISTS idx_subreddits_subscribers ON subreddits(subscribers DESC, position);
+            CREATE INDEX IF NOT EXISTS idx_subreddits_activity ON subreddits(activity_score DESC, position);
+            CREATE INDEX IF NOT EXISTS idx_subreddits_last_updated ON subreddits(last_updated);
+            CREATE TABLE IF NOT EXISTS catalog_info (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            """
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict:
+        activity_score = row["activity_score"]
+        return {
+            "name": row["name"],
+            "display_name": row["display_name"],
+            "subscribers": row["subscribers"],
+            "category": row["category"],
+            "topics": json.loads(row["topics"]),
+            "activity_score": int(activity_score) if float(activity_score).is_integer() else activity_score,
+            "last_updated": row["last_updated"],
+        }
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM subreddits").fetchone()[0]
+
+    def import_metadata(self, metadata: Dict):
+        """Bulk-load a metadata dict in the subreddit_metadata.json layout"""
+        with self._lock:
+            with self._conn:
+                for name, data in metadata.get("subreddits", {}).items():
+                    self._upsert(name, data)
+                if metadata.get("last_updated"):
+                    self._set_info("last_updated", metadata["last_updated"])
+
+    def _upsert(self, name: str, data: Dict):
+        position = self._conn.execute(
+            "SELECT COALESCE((SELECT position FROM subreddits WHERE name = ?), (SELECT COALESCE(MAX(position), -1) + 1 FROM subreddits))",
+            (name,),
+        ).fetchone()[0]
+        self._conn.execute(
+            """
+            INSERT OR REPLACE INTO subreddits
+                (name, position, display_name, subscribers, category, topics, activity_score, last_updated)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                name,
+                position,
+                data.get("display_name", name),
+                int(data.get("subscribers") or 0),
+                data.get("category", ""),
+                json.dumps(data.get("topics", [])),
+                data.get("activity_score", 0),
+                data.get("last_updated"),
+            ),
+        )
+
+    def update_fields(self, name: str, **fields):
+        """Atomically update some columns of one subreddit"""
+        allowed = {"display_name", "subscribers", "category", "activity_score", "last_updated"}
+        assignments = [f"{column} = ?" for column in fields if column in allowed]
+        values = [value for column, value in fields.items() if column in allowed]
+        if "topics" in fields:
+            assignments.append("topics = ?")
+            values.append(json.dumps(fields["topics"]))
+        if not assignments:
+            return
+        with self._lock:
+            with self._conn:
+                self._conn.execute(f"UPDATE subreddits SET {', '.join(assignments)} WHERE name = ?", (*values, name))
+
+    def all(self) -> Dict[str, Dict]:
+        """All subreddits keyed by name, in catalog order"""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM subreddits ORDER BY position").fetchall()
+        return {row["name"]: self._to_dict(row) for row in rows}
+
+    def categories(self) -> Dict[str, List[str]]:
+        """Subreddit names grouped by category, in catalog order"""
+        categories: Dict[str, List[str]] = {}
+        with self._lock:
+            rows = self._conn.execute("SELECT name, category FROM subreddits ORDER BY position").fetchall()
+        for row in rows:
+            categories.setdefault(row["category"], []).append(row["name"])
+        return categories
+
+    def list_page(self, offset: int = 0, limit: int = 100, sort: str = "subscribers", category: Optional[str] = None) -> Tuple[List[Dict], int]:
+        """One page of subreddits in a pre-sorted (indexed) order, plus the total count"""
+        order_by = SORT_ORDERS.get(sort, SORT_ORDERS["subscribers"])
+        where, params = ("WHERE category = ?", [category]) if category else ("", [])
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM subreddits {where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT * FROM subreddits {where} ORDER BY {order_by} LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+        return [self._to_dict(row) for row in rows], total
+
+    def stale(self, older_than: str) -> List[str]:
+        """Names of subreddits last updated before an ISO timestamp (or never)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name FROM subreddits WHERE last_updated IS NULL OR last_updated < ? ORDER BY last_updated",
+                (older_than,),
+            ).fetchall()
+        return [row["name"] for row in rows]
+
+    def _set_info(self, key: str, value: str):
+        self._conn.execute("INSERT OR REPLACE INTO catalog_info (key, value) VALUES (?, ?)", (key, value))
+
+    def set_info(self, key: str, value: str):
+        with self._lock:
+            with self._conn:
+                self._set_info(key, value)
+
+    def get_info(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM catalog_info WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
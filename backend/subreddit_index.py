@@ -0,0 +1,92 @@
+import heapq
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Terms intersect the postings of their trigrams; shorter terms fall back
+# to a scan since they match most of the catalog anyway
+GRAM_SIZE = 3
+
+
+def _grams(text: str, size: int) -> Set[str]:
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class SubredditIndex:
+    """Inverted trigram index over subreddit topics, display names and categories.
+
+    A term matches a subreddit when it is a substring of any indexed field,
+    the same rule as a linear `term in topic` scan, but candidates come from
+    trigram postings so lookups do not touch every subreddit.
+    """
+
+    def __init__(self, subreddits: Dict[str, Dict]):
+        self.names: List[str] = []
+        self.records: List[Dict] = []
+        self.fields: List[List[str]] = []
+        self.postings: Dict[str, Set[int]] = {}
+
+        for position, (name, data) in enumerate(subreddits.items()):
+            self.names.append(name)
+            self.records.append(data)
+            fields = [str(topic).lower() for topic in data.get("topics", [])]
+            fields.append(str(data.get("display_name", "")).lower())
+            fields.append(str(data.get("category", "")).lower())
+            fields = [field for field in fields if field]
+            self.fields.append(fields)
+            for field in fields:
+                for gram in _grams(field, GRAM_SIZE):
+                    self.postings.setdefault(gram, set()).add(position)
+
+        # Subreddits by activity (ties keep catalog order) for filling results
+        # with unmatched subreddits without scoring all of them
+        self.by_activity = sorted(
+            range(len(self.names)), key=lambda i: (-self.records[i].get("activity_score", 0), i)
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def match(self, term: str) -> Set[int]:
+        """Positions of subreddits with a field containing term"""
+        term = term.lower()
+        if len(term) < GRAM_SIZE:
+            return {i for i, fields in enumerate(self.fields) if any(term in field for field in fields)}
+        postings = sorted((self.postings.get(gram, set()) for gram in _grams(term, GRAM_SIZE)), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                return candidates
+        if len(term) == GRAM_SIZE:
+            return candidates
+        return {i for i in candidates if any(term in field for field in self.fields[i])}
+
+    def rank(self, weighted_terms: Iterable[Tuple[str, float]], activity_weight: float, limit: int) -> List[Tuple[int, float]]:
+        """Top subreddits by summed term weights plus activity_score * activity_weight.
+
+        Returns (position, score) pairs, highest score first, ties in catalog
+        order. An empty term matches every subreddit, as in a substring scan.
+        """
+        base = 0
+        term_scores: Dict[int, float] = {}
+        for term, weight in weighted_terms:
+            if not term:
+                base += weight
+                continue
+            for position in self.match(term):
+                term_scores[position] = term_scores.get(position, 0) + weight
+
+        def score(position: int) -> float:
+            activity = self.records[position].get("activity_score", 0)
+            return base + term_scores.get(position, 0) + activity * activity_weight
+
+        candidates = set(term_scores)
+        unmatched = 0
+        for position in self.by_activity:
+            if unmatched >= limit:
+                break
+            if position not in term_scores:
+                candidates.add(position)
+                unmatched += 1
+
+        top = heapq.nsmallest(limit, candidates, key=lambda position: (-score(position), position))
+        return [(position, score(position)) for position in top]
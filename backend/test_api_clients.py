@@ -0,0 +1,77 @@
+import asyncio
+
+from fastapi import HTTPException
+
+from client_registry import ClientRegistry, ClientSet, current_client_key
+
+# Behavior checks for API client selection (fake clients; no OpenAI or Reddit calls)
+
+CONFIG = {"openai_api_key": "sk-test", "reddit_client_id": "id", "reddit_client_secret": "secret",
+          "reddit_user_agent": "IdeaSpark/1.0"}
+
+def fake_registry():
+    return ClientRegistry(lambda config: ClientSet(object(), object()))
+
+def test_configure_replaces_partial_default():
+    """With only OPENAI_API_KEY in the environment, /configure-api makes header-less requests work"""
+    print("Testing default credentials after configure...")
+    import main
+    original = main.api_clients.registry
+    main.api_clients.registry = fake_registry()
+    try:
+        main.api_clients.registry.default = ClientSet(object(), None)  # environment: OpenAI only
+        try:
+            main.check_api_configuration()
+            assert False, "missing Reddit client was not reported"
+        except HTTPException as e:
+            assert "Reddit" in e.detail
+        first = main.api_clients.configure(CONFIG)
+        main.check_api_configuration()
+        other = {**CONFIG, "openai_api_key": "sk-other"}
+        second = main.api_clients.configure(other)
+        # The most recently configured credentials become the default
+        assert first != second
+        assert main.api_clients.registry.default is main.api_clients.registry.get_or_create(other)[1]
+    finally:
+        main.api_clients.registry = original
+    print("✅ Success!")
+
+def test_job_with_expired_client_key():
+    """Jobs run with their submitter's clients and fail explicitly once those are gone"""
+    print("Testing jobs with expired client keys...")
+    import main
+    original = main.api_clients.registry
+    main.api_clients.registry = fake_registry()
+    try:
+        key = main.api_clients.configure(CONFIG)
+
+        async def handler(payload, report):
+            return current_client_key.get()
+
+        run = main.with_job_clients(handler)
+        assert asyncio.run(run({main.JOB_CLIENT_KEY_FIELD: key}, None)) == key
+        try:
+            asyncio.run(run({main.JOB_CLIENT_KEY_FIELD: "expired"}, None))
+            assert False, "expired client key was not reported"
+        except HTTPException as e:
+            assert e.status_code == 401 and "expired" in e.detail
+    finally:
+        main.api_clients.registry = original
+    print("✅ Success!")
+
+if __name__ == "__main__":
+    print("🧪 Testing API Clients\n")
+
+    results = {}
+    for name, test in [("Default credentials", test_configure_replaces_partial_default),
+                       ("Expired job client key", test_job_with_expired_client_key)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} failed: {e}")
+            results[name] = False
+
+    print(f"\n📊 Test Results:")
+    for name, passed in results.items():
+        print(f"  - {name}: {'✅' if passed else '❌'}")
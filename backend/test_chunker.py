@@ -0,0 +1,50 @@
+from chunker import chunk_contents, count_tokens, split_oversized
+
+# Behavior checks for token-budgeted chunking (works with or without tiktoken)
+
+LONG_POST = "\n\n".join(f"Paragraph {i}. " + "I keep missing deadlines on client work. " * 20 for i in range(6))
+
+def test_split_oversized():
+    """Oversized text is split on paragraph boundaries into pieces within the budget, losing nothing"""
+    print("Testing oversized post splitting...")
+    pieces = split_oversized(LONG_POST, 300)
+    assert len(pieces) > 1
+    assert all(count_tokens(piece) <= 300 for piece in pieces)
+    assert "".join(pieces) == LONG_POST
+    assert all(piece.lstrip("\n").startswith("Paragraph") for piece in pieces)
+    print("✅ Success!")
+
+def test_chunks_within_budget():
+    """Every chunk fits the target and every post ends up in a chunk"""
+    print("Testing chunk budgets...")
+    posts = [LONG_POST] + [f"Short post {i} about invoices." for i in range(30)]
+    chunks = chunk_contents(posts, 400)
+    assert all(count_tokens(chunk) <= 400 for chunk in chunks)
+    assert all(any(f"Short post {i} " in chunk for chunk in chunks) for i in range(30))
+    print("✅ Success!")
+
+def test_first_fit_packing():
+    """Small posts fill space left in earlier chunks instead of opening new ones"""
+    print("Testing first-fit packing...")
+    posts = ["word " * 150, "word " * 150, "tiny post"]
+    chunks = chunk_contents(posts, count_tokens("word " * 150) + 20)
+    assert len(chunks) == 2 and chunks[0].endswith("tiny post"), [len(chunk) for chunk in chunks]
+    print("✅ Success!")
+
+if __name__ == "__main__":
+    print("🧪 Testing Chunker\n")
+
+    results = {}
+    for name, test in [("Oversized posts", test_split_oversized),
+                       ("Chunk budgets", test_chunks_within_budget),
+                       ("First-fit packing", test_first_fit_packing)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} failed: {e}")
+            results[name] = False
+
+    print(f"\n📊 Test Results:")
+    for name, passed in results.items():
+        print(f"  - {name}: {'✅' if passed else '❌'}")
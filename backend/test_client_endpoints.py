@@ -0,0 +1,47 @@
+import os
+
+import requests
+from dotenv import load_dotenv
+
+# Test default credentials for requests without an X-Client-Key header.
+# Start the backend with only OPENAI_API_KEY set (no REDDIT_* variables), then
+# run this script with the full credentials in .env or the environment.
+BASE_URL = "http://localhost:8000"
+
+def test_configure_then_search_without_header():
+    """Configuring the API should make its clients the default for header-less requests"""
+    print("Testing default credentials after /configure-api...")
+    load_dotenv()
+    config = {
+        "openai_api_key": os.getenv("OPENAI_API_KEY"),
+        "reddit_client_id": os.getenv("REDDIT_CLIENT_ID"),
+        "reddit_client_secret": os.getenv("REDDIT_CLIENT_SECRET"),
+        "reddit_user_agent": os.getenv("REDDIT_USER_AGENT", "IdeaSpark/1.0")
+    }
+
+    try:
+        response = requests.post(f"{BASE_URL}/configure-api", json=config)
+        if response.status_code != 200:
+            print(f"❌ Configuration error: {response.status_code} - {response.text}")
+            return False
+        print(f"Configured client set {response.json().get('clientKey', '')[:8]}")
+
+        # Plain requests session, so no X-Client-Key header is sent
+        response = requests.post(f"{BASE_URL}/search-reddit", json={"niche": "time management"})
+        if response.status_code != 200:
+            print(f"❌ Header-less search failed: {response.status_code} - {response.text}")
+            return False
+        print("✅ Success!")
+        print(f"Found {len(response.json()['redditPosts'])} posts with the default credentials")
+        return True
+    except Exception as e:
+        print(f"❌ Exception: {e}")
+        return False
+
+if __name__ == "__main__":
+    print("🧪 Testing API Client Selection\n")
+
+    test1 = test_configure_then_search_without_header()
+
+    print(f"\n📊 Test Results:")
+    print(f"  - Configure, then search without header: {'✅' if test1 else '❌'}")
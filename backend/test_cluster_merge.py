@@ -0,0 +1,50 @@
+from cluster_merge import merge_clusters
+
+# Behavior checks for merging duplicate pain-point clusters
+
+def cluster(name, frequency, intensity, themes=(), quotes=(), points=()):
+    return {"name": name, "frequency": frequency, "emotionIntensity": intensity, "solutionGap": intensity,
+            "themes": list(themes), "quotes": list(quotes), "painPoints": list(points)}
+
+def test_merges_similar_names():
+    """Clusters that differ only in word forms merge; unrelated ones stay apart"""
+    print("Testing similar cluster merging...")
+    merged = merge_clusters([
+        cluster("Time management struggles", 3, 8, ["deadlines"], ["I miss deadlines"], ["Missing deadlines"]),
+        cluster("Pricing freelance work", 2, 6),
+        cluster("Managing time", 1, 4, ["deadlines", "focus"], ["I miss deadlines"], ["missing deadlines", "Focus"]),
+    ])
+    assert [c["name"] for c in merged] == ["Time management struggles", "Pricing freelance work"], merged
+    combined = merged[0]
+    assert combined["frequency"] == 4
+    assert combined["emotionIntensity"] == 7.0  # (8 * 3 + 4 * 1) / 4
+    assert combined["themes"] == ["deadlines", "focus"]
+    assert combined["quotes"] == ["I miss deadlines"]
+    assert combined["painPoints"] == ["Missing deadlines", "Focus"]
+    print("✅ Success!")
+
+def test_passthrough():
+    """Fewer than two clusters, and non-dict entries, are handled without merging"""
+    print("Testing passthrough...")
+    single = cluster("Finding clients", 1, 5)
+    assert merge_clusters([single]) == [single]
+    assert merge_clusters(["not a cluster", single]) == [single]
+    assert merge_clusters([]) == []
+    print("✅ Success!")
+
+if __name__ == "__main__":
+    print("🧪 Testing Cluster Merging\n")
+
+    results = {}
+    for name, test in [("Similar clusters", test_merges_similar_names),
+                       ("Passthrough", test_passthrough)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} failed: {e}")
+            results[name] = False
+
+    print(f"\n📊 Test Results:")
+    for name, passed in results.items():
+        print(f"  - {name}: {'✅' if passed else '❌'}")
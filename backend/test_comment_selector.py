@@ -0,0 +1,66 @@
+from comment_selector import top_comments
+
+# Behavior checks for top comment selection on fake comment trees
+
+class Comment:
+    def __init__(self, body, score, replies=(), author="user"):
+        self.body = body
+        self.score = score
+        self.author = author
+        self.replies = list(replies)
+
+class MoreComments:
+    """Stand-in for PRAW's "load more comments" placeholder (no body)"""
+    replies = []
+
+def sample_forest():
+    deep_thread = Comment("a long first thread", 1, [Comment(f"reply number {i} here", 100 + i) for i in range(50)])
+    return [deep_thread] + [Comment(f"top level comment {i}", 10 + i) for i in range(5)] + [MoreComments()]
+
+def test_best_first():
+    """The k highest-scored comments are returned best first, short ones skipped"""
+    print("Testing top-k selection...")
+    forest = sample_forest() + [Comment("too short", 10000)]
+    scores = [comment["score"] for comment in top_comments(forest, k=3)]
+    assert scores == [149, 148, 147], scores
+    print("✅ Success!")
+
+def test_non_positive_k():
+    """k <= 0 selects nothing instead of failing"""
+    print("Testing k <= 0...")
+    assert top_comments(sample_forest(), k=0) == []
+    assert top_comments(sample_forest(), k=-1) == []
+    print("✅ Success!")
+
+def test_visit_budget_reaches_top_level():
+    """max_visited is spent on top-level comments before a deep thread's replies"""
+    print("Testing breadth-first visit budget...")
+    scores = [comment["score"] for comment in top_comments(sample_forest(), k=3, max_visited=6)]
+    assert scores == [14, 13, 12], scores
+    print("✅ Success!")
+
+def test_max_depth():
+    """max_depth=0 keeps the walk to top-level comments"""
+    print("Testing max depth...")
+    scores = [comment["score"] for comment in top_comments(sample_forest(), k=10, max_depth=0)]
+    assert max(scores) == 14 and len(scores) == 6, scores
+    print("✅ Success!")
+
+if __name__ == "__main__":
+    print("🧪 Testing Comment Selection\n")
+
+    results = {}
+    for name, test in [("Best first", test_best_first),
+                       ("k <= 0", test_non_positive_k),
+                       ("Visit budget", test_visit_budget_reaches_top_level),
+                       ("Max depth", test_max_depth)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} failed: {e}")
+            results[name] = False
+
+    print(f"\n📊 Test Results:")
+    for name, passed in results.items():
+        print(f"  - {name}: {'✅' if passed else '❌'}")
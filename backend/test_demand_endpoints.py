@@ -0,0 +1,34 @@
+import requests
+
+# Test the demand validation endpoints
+BASE_URL = "http://localhost:8000"
+
+def test_validate_demand_batch():
+    """Test validating several niches with one request"""
+    print("Testing validate-demand-batch endpoint...")
+
+    niches = ["time management for freelancers", "meal planning", "home workouts"]
+
+    try:
+        response = requests.post(f"{BASE_URL}/validate-demand-batch", json={"niches": niches})
+        if response.status_code == 200:
+            data = response.json()
+            print("✅ Success!")
+            for result in data['results']:
+                note = f" ({result['note']})" if result.get('note') else ""
+                print(f"  - {result['niche']}: {result['trend']}{note}")
+            return True
+        else:
+            print(f"❌ Error: {response.status_code} - {response.text}")
+            return False
+    except Exception as e:
+        print(f"❌ Exception: {e}")
+        return False
+
+if __name__ == "__main__":
+    print("🧪 Testing Demand Endpoints\n")
+
+    test1 = test_validate_demand_batch()
+
+    print(f"\n📊 Test Results:")
+    print(f"  - Batch demand validation: {'✅' if test1 else '❌'}")
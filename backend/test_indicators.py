@@ -0,0 +1,60 @@
+from indicators import KeywordMatcher
+
+# Behavior checks for the compiled indicator matcher
+
+def test_word_boundaries_and_case():
+    """Phrases match whole words in any case, with curly apostrophes and extra whitespace"""
+    print("Testing word boundaries...")
+    matcher = KeywordMatcher("test", ["company", "i'm stuck"])
+    assert not matcher.matches("Time to accompany a friend")
+    assert matcher.first_match("Our COMPANY is hiring") == "company"
+    assert matcher.find_all("I’m   stuck again") == ["i'm stuck"]
+    print("✅ Success!")
+
+def test_wildcards():
+    """A trailing * matches any word ending and the hit goes to the longest prefix"""
+    print("Testing wildcard patterns...")
+    matcher = KeywordMatcher("test", ["struggl*", "problem*", "problems with*"])
+    assert matcher.find_all("Struggling with problems") == ["struggl*", "problem*"]
+    assert matcher.find_all("problems without end") == ["problems with*"]
+    assert not matcher.matches("an unproblematic week")
+    print("✅ Success!")
+
+def test_phrase_preferred_over_wildcard():
+    """A longer phrase sharing a wildcard's prefix wins ("help me" over "help*")"""
+    print("Testing phrase versus wildcard prefix...")
+    matcher = KeywordMatcher("test", ["help*", "help me"])
+    assert matcher.find_all("please help me now") == ["help me"]
+    assert matcher.find_all("helpme") == ["help*"]
+    assert matcher.find_all("help meat") == ["help*"]
+    assert matcher.stats()["hits"] == {"help*": 2, "help me": 1}
+    print("✅ Success!")
+
+def test_stats():
+    """Every scan is counted, matched or not"""
+    print("Testing hit stats...")
+    matcher = KeywordMatcher("test", ["advice"])
+    assert matcher.match_many(["need advice", "nothing here", None]) == [True, False, False]
+    stats = matcher.stats()
+    assert stats["textsScanned"] == 3 and stats["textsMatched"] == 1
+    assert stats["hits"] == {"advice": 1}
+    print("✅ Success!")
+
+if __name__ == "__main__":
+    print("🧪 Testing Indicator Matching\n")
+
+    results = {}
+    for name, test in [("Word boundaries", test_word_boundaries_and_case),
+                       ("Wildcards", test_wildcards),
+                       ("Phrase vs wildcard", test_phrase_preferred_over_wildcard),
+                       ("Stats", test_stats)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} failed: {e}")
+            results[name] = False
+
+    print(f"\n📊 Test Results:")
+    for name, passed in results.items():
+        print(f"  - {name}: {'✅' if passed else '❌'}")
@@ -0,0 +1,58 @@
+import requests
+import time
+
+# Test the background job endpoints
+BASE_URL = "http://localhost:8000"
+
+def test_submit_and_poll_job():
+    """Test submitting an analysis job and polling it to completion"""
+    print("Testing jobs endpoints...")
+
+    job = {
+        "kind": "analysis",
+        "payload": {
+            "niche": "time management for freelancers",
+            "profile": {"interest": "technology", "skill": "programming", "problem": "time management"},
+            "selected_subreddits": ["productivity", "freelance"]
+        }
+    }
+
+    try:
+        response = requests.post(f"{BASE_URL}/jobs", json=job)
+        if response.status_code != 200:
+            print(f"❌ Error: {response.status_code} - {response.text}")
+            return False
+        job_id = response.json()["jobId"]
+        print(f"Submitted job {job_id}")
+
+        # Submitting the same job again while it runs should return the same ID
+        duplicate = requests.post(f"{BASE_URL}/jobs", json=job).json()
+        if duplicate["jobId"] == job_id:
+            print("  - Duplicate submission deduplicated")
+
+        for _ in range(300):
+            status = requests.get(f"{BASE_URL}/jobs/{job_id}").json()
+            if status["status"] in ("completed", "failed"):
+                break
+            print(f"  - {status['status']}: {status['progress']}")
+            time.sleep(2)
+
+        if status["status"] != "completed":
+            print(f"❌ Job did not complete: {status['status']} - {status.get('error')}")
+            return False
+
+        result = requests.get(f"{BASE_URL}/jobs/{job_id}/result").json()
+        print("✅ Success!")
+        print(f"Found {len(result['redditPosts'])} posts, {len(result['analysis'].get('clusters', []))} clusters and {len(result['ideas'])} ideas")
+        return True
+    except Exception as e:
+        print(f"❌ Exception: {e}")
+        return False
+
+if __name__ == "__main__":
+    print("🧪 Testing Job Endpoints\n")
+
+    test1 = test_submit_and_poll_job()
+
+    print(f"\n📊 Test Results:")
+    print(f"  - Analysis job: {'✅' if test1 else '❌'}")
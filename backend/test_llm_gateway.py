@@ -0,0 +1,80 @@
+import asyncio
+
+from llm_gateway import LLMGateway, TokenBucket
+
+# Behavior checks for the LLM gateway budgets (no OpenAI calls are made)
+
+class RateLimited(Exception):
+    pass
+
+def retry_after(e):
+    return 0 if isinstance(e, RateLimited) else None
+
+def test_token_bucket_wait():
+    """A drained bucket waits for the refill, an unlimited one never waits"""
+    print("Testing token bucket refill...")
+    bucket = TokenBucket(60)  # one unit per second
+    bucket.consume(60, bucket.updated)
+    assert abs(bucket.wait_time(3, bucket.updated) - 3.0) < 1e-6
+    assert TokenBucket(0).wait_time(1000, 0) == 0.0
+    print("✅ Success!")
+
+def test_rate_limited_attempts_are_refunded():
+    """Tokens reserved for 429'd attempts are given back, so only the successful call counts"""
+    print("Testing token refund of rate-limited attempts...")
+    gateway = LLMGateway(tpm=100000, backoff_base=0.01, backoff_max=0.01)
+    attempts = []
+
+    async def fn():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RateLimited()
+        return "ok"
+
+    result = asyncio.run(gateway.call(fn, 5000, retry_after))
+    stats = gateway.stats()
+    assert result == "ok" and len(attempts) == 3
+    assert stats["rateLimited"] == 2
+    assert stats["tokensUsed"] == 5000, stats["tokensUsed"]
+    assert stats["tokenBudget"] >= 95000, stats["tokenBudget"]
+    print("✅ Success!")
+
+def test_usage_settles_reservation():
+    """Reported usage replaces the estimate; other errors are raised without retrying"""
+    print("Testing usage settlement...")
+    gateway = LLMGateway(tpm=100000)
+
+    async def fn():
+        return {"total_tokens": 1200}
+
+    asyncio.run(gateway.call(fn, 5000, retry_after, usage=lambda result: result["total_tokens"]))
+    assert gateway.stats()["tokensUsed"] == 1200
+
+    async def broken():
+        raise ValueError("bad request")
+
+    try:
+        asyncio.run(gateway.call(broken, 100, retry_after))
+        assert False, "ValueError was not raised"
+    except ValueError:
+        pass
+    assert gateway.stats()["rateLimited"] == 0
+    print("✅ Success!")
+
+if __name__ == "__main__":
+    print("🧪 Testing LLM Gateway\n")
+
+    results = {}
+    for name, test in [("Token bucket", test_token_bucket_wait),
+                       ("429 refund", test_rate_limited_attempts_are_refunded),
+                       ("Usage settlement", test_usage_settles_reservation)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} failed: {e}")
+            results[name] = False
+
+    print(f"\n📊 Test Results:")
+    for name, passed in results.items():
+        print(f"  - {name}: {'✅' if passed else '❌'}")
@@ -0,0 +1,85 @@
+import asyncio
+import os
+import tempfile
+
+from metadata_refresher import MetadataRefresher
+from subreddit_catalog import SubredditCatalog
+from workers import WorkerPool
+
+# Behavior checks for the background subreddit metadata refresh (fake fetches, temporary catalog)
+
+class RateLimited(Exception):
+    pass
+
+def make_catalog(directory):
+    catalog = SubredditCatalog(os.path.join(directory, "catalog.db"))
+    catalog.import_metadata({"subreddits": {
+        "freelance": {"subscribers": 1, "category": "work", "last_updated": "2000-01-01T00:00:00"},
+        "smallbusiness": {"subscribers": 2, "category": "work"},
+        "productivity": {"subscribers": 3, "category": "self"},
+    }})
+    return catalog
+
+def test_refresh_with_rate_limit_and_failure():
+    """Stale rows are refreshed, a rate-limited fetch is retried and a failure is reported"""
+    print("Testing metadata refresh...")
+    calls = []
+
+    def fetch(name):
+        calls.append(name)
+        if name == "smallbusiness" and calls.count(name) == 1:
+            raise RateLimited()
+        if name == "productivity":
+            raise ValueError("banned")
+        return {"subscribers": 100 + len(calls)}
+
+    with tempfile.TemporaryDirectory() as directory:
+        catalog = make_catalog(directory)
+        pool = WorkerPool("test-refresh", 2)
+        refreshed = []
+        refresher = MetadataRefresher(
+            catalog, fetch, pool, batch_size=2,
+            retry_after=lambda e: 0.01 if isinstance(e, RateLimited) else None,
+            on_refreshed=lambda: refreshed.append(True)
+        )
+        status = asyncio.run(refresher.run_once())
+        pool.shutdown()
+        rows = {row["name"]: row for row in catalog.list_page(limit=10)[0]}
+        # The failed subreddit stays stale and is retried on the next refresh
+        still_stale = catalog.stale("1999-01-01T00:00:00")
+
+    assert status["refreshed"] == 2 and status["failed"] == 1, status
+    assert status["rateLimitWaits"] == 1 and status["remaining"] == 0
+    assert calls.count("smallbusiness") == 2
+    assert rows["smallbusiness"]["subscribers"] > 100 and rows["productivity"]["subscribers"] == 3
+    assert still_stale == ["productivity"], still_stale
+    assert refreshed == [True]
+    print("✅ Success!")
+
+def test_skips_when_not_ready():
+    """Nothing is fetched while the Reddit client is not configured"""
+    print("Testing refresh without Reddit client...")
+    with tempfile.TemporaryDirectory() as directory:
+        pool = WorkerPool("test-refresh", 1)
+        refresher = MetadataRefresher(make_catalog(directory), lambda name: {}, pool, ready=lambda: False)
+        status = asyncio.run(refresher.run_once())
+        pool.shutdown()
+    assert status["lastStarted"] is None and status["refreshed"] == 0
+    print("✅ Success!")
+
+if __name__ == "__main__":
+    print("🧪 Testing Metadata Refresher\n")
+
+    results = {}
+    for name, test in [("Refresh", test_refresh_with_rate_limit_and_failure),
+                       ("Not ready", test_skips_when_not_ready)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} failed: {e}")
+            results[name] = False
+
+    print(f"\n📊 Test Results:")
+    for name, passed in results.items():
+        print(f"  - {name}: {'✅' if passed else '❌'}")
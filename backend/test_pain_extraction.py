@@ -0,0 +1,57 @@
+from pain_extraction import extract_pain_content, extract_post, split_sentences
+
+# Behavior checks for local pain sentence extraction
+
+POST = (
+    "Struggling to find clients as a new freelancer\n"
+    "I have been freelancing for a year. The weather here is lovely. "
+    "I can't find clients and it is really frustrating. We moved last spring."
+    "\n\n--- COMMENTS ---\n"
+    "\nComment by alice (score: 12):\nSame here, cold outreach is a nightmare. Good luck!\n"
+    "\nComment by bob (score: 3):\nNice photo of your desk.\n"
+)
+
+def test_title_stays_its_own_sentence():
+    """A title line without punctuation does not merge into the first body sentence"""
+    print("Testing title separation...")
+    text, _, _ = extract_post(POST)
+    assert text.startswith("Struggling to find clients as a new freelancer\nI "), text
+    assert split_sentences(text)[0] == "Struggling to find clients as a new freelancer"
+    print("✅ Success!")
+
+def test_keeps_pain_sentences_only():
+    """Pain sentences and their comment headers are kept, neutral ones dropped"""
+    print("Testing sentence selection...")
+    text, sentences, kept = extract_post(POST)
+    assert "I can't find clients and it is really frustrating." in text
+    assert "Comment by alice (score: 12):\nSame here, cold outreach is a nightmare." in text
+    assert "weather" not in text and "bob" not in text
+    assert kept < sentences
+    print("✅ Success!")
+
+def test_report():
+    """The report counts posts and tokens before and after extraction"""
+    print("Testing extraction report...")
+    extracted, report = extract_pain_content([POST, "[deleted]"])
+    assert len(extracted) == 1
+    assert report["posts"] == 2 and report["postsKept"] == 1
+    assert 0 < report["tokensAfter"] < report["tokensBefore"]
+    print("✅ Success!")
+
+if __name__ == "__main__":
+    print("🧪 Testing Pain Extraction\n")
+
+    results = {}
+    for name, test in [("Title separation", test_title_stays_its_own_sentence),
+                       ("Sentence selection", test_keeps_pain_sentences_only),
+                       ("Report", test_report)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} failed: {e}")
+            results[name] = False
+
+    print(f"\n📊 Test Results:")
+    for name, passed in results.items():
+        print(f"  - {name}: {'✅' if passed else '❌'}")
@@ -0,0 +1,60 @@
+import time
+
+from post_ranking import rank_posts, score_posts, tfidf_similarity
+
+# Behavior checks for search result ranking
+
+NOW = time.time()
+
+def post(title, selftext="", score=0, num_comments=0, age_days=0):
+    return {"title": title, "selftext": selftext, "score": score, "num_comments": num_comments,
+            "created_utc": NOW - age_days * 86400}
+
+def test_relevance():
+    """Documents sharing rarer query terms score higher; no shared terms score 0"""
+    print("Testing TF-IDF relevance...")
+    similarity = tfidf_similarity("invoice reminders", [
+        "how do you send invoice reminders",
+        "invoice templates for freelancers",
+        "best hiking trails",
+    ])
+    assert similarity[0] > similarity[1] > similarity[2] == 0
+    assert not tfidf_similarity("the and of", ["anything"]).any()
+    print("✅ Success!")
+
+def test_components():
+    """Recency halves at the half-life and each component stays within 0-1"""
+    print("Testing ranking components...")
+    posts = [post("invoice help", age_days=0, score=100, num_comments=20), post("invoice help", age_days=90)]
+    components = score_posts("invoice", posts, [1, 0], now=NOW)
+    assert abs(components["recency"][1] - 0.5) < 1e-3
+    for name in ("relevance", "recency", "engagement", "problem"):
+        assert ((components[name] >= 0) & (components[name] <= 1 + 1e-9)).all(), name
+    assert components["score"][0] > components["score"][1]
+    print("✅ Success!")
+
+def test_rank_order():
+    """Posts are ordered best first and ties keep their incoming order"""
+    print("Testing rank order...")
+    posts = [post("unrelated cooking tips"), post("chasing late invoice payments", num_comments=5), post("unrelated cooking tips")]
+    assert rank_posts("late invoice payments", posts, [0, 1, 0]) == [1, 0, 2]
+    assert rank_posts("anything", [], []) == []
+    print("✅ Success!")
+
+if __name__ == "__main__":
+    print("🧪 Testing Post Ranking\n")
+
+    results = {}
+    for name, test in [("Relevance", test_relevance),
+                       ("Components", test_components),
+                       ("Rank order", test_rank_order)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} failed: {e}")
+            results[name] = False
+
+    print(f"\n📊 Test Results:")
+    for name, passed in results.items():
+        print(f"  - {name}: {'✅' if passed else '❌'}")
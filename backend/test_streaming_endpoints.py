@@ -0,0 +1,95 @@
+import requests
+import json
+
+# Test the server-sent event (SSE) streaming endpoints
+BASE_URL = "http://localhost:8000"
+
+def read_events(response):
+    """Parse a text/event-stream response into (event, data) pairs"""
+    event = None
+    for line in response.iter_lines(decode_unicode=True):
+        if line.startswith("event: "):
+            event = line[len("event: "):]
+        elif line.startswith("data: "):
+            yield event, json.loads(line[len("data: "):])
+
+def test_process_pain_points_stream():
+    """Test streaming pain point analysis"""
+    print("Testing process-pain-points/stream endpoint...")
+
+    data = {
+        "painPoints": [
+            "I'm struggling with time management as a freelancer. I can't seem to keep track of all my projects and deadlines.",
+            "Finding clients is really hard. I don't know where to look or how to pitch my services effectively."
+        ]
+    }
+
+    try:
+        with requests.post(f"{BASE_URL}/process-pain-points/stream", json=data, stream=True) as response:
+            if response.status_code != 200:
+                print(f"❌ Error: {response.status_code} - {response.text}")
+                return False
+            result = None
+            for event, payload in read_events(response):
+                if event == "part":
+                    print(f"  - Part {payload['part']}/{payload['totalParts']}: {len(payload['clusters'])} clusters")
+                elif event == "result":
+                    result = payload
+                elif event == "error":
+                    print(f"❌ Stream error: {payload['detail']}")
+                    return False
+            if result and "analysis" in result:
+                print("✅ Success!")
+                print(f"Final analysis has {len(result['analysis'].get('clusters', []))} clusters")
+                return True
+            print("❌ Stream ended without a result event")
+            return False
+    except Exception as e:
+        print(f"❌ Exception: {e}")
+        return False
+
+def test_generate_ideas_stream():
+    """Test streaming idea generation"""
+    print("\nTesting generate-ideas/stream endpoint...")
+
+    data = {
+        "painPoints": [
+            {"point": "Hard to track freelance deadlines", "quote": "", "emotionIntensity": 8, "solutionGap": 7}
+        ],
+        "profile": {"interest": "technology", "skill": "programming", "problem": "time management"}
+    }
+
+    try:
+        with requests.post(f"{BASE_URL}/generate-ideas/stream", json=data, stream=True) as response:
+            if response.status_code != 200:
+                print(f"❌ Error: {response.status_code} - {response.text}")
+                return False
+            tokens = 0
+            result = None
+            for event, payload in read_events(response):
+                if event == "token":
+                    tokens += 1
+                elif event == "result":
+                    result = payload
+                elif event == "error":
+                    print(f"❌ Stream error: {payload['detail']}")
+                    return False
+            if result and "ideas" in result:
+                print("✅ Success!")
+                print(f"Received {tokens} token events and {len(result['ideas'])} ideas")
+                return True
+            print("❌ Stream ended without a result event")
+            return False
+    except Exception as e:
+        print(f"❌ Exception: {e}")
+        return False
+
+if __name__ == "__main__":
+    print("🧪 Testing Streaming Endpoints\n")
+
+    test1 = test_process_pain_points_stream()
+    test2 = test_generate_ideas_stream()
+
+    print(f"\n📊 Test Results:")
+    print(f"  - Pain point stream: {'✅' if test1 else '❌'}")
+    print(f"  - Idea stream: {'✅' if test2 else '❌'}")
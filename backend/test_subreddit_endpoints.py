@@ -1,4 +1,5 @@
 import requests
+import time
 import json
 
 # Test the new subreddit endpoints
@@ -40,7 +41,7 @@ def test_get_all_subreddits():
         if response.status_code == 200:
             data = response.json()
             print("✅ Success!")
-            print(f"Found {len(data['subreddits'])} total subreddits")
+            print(f"Found {data['total']} total subreddits ({len(data['subreddits'])} on page {data['page']})")
             for subreddit in data['subreddits'][:3]:  # Show first 3
                 print(f"  - {subreddit['display_name']} ({subreddit['subscribers']} members)")
             return True
@@ -77,6 +78,31 @@ def test_search_reddit_targeted():
         print(f"❌ Exception: {e}")
         return False
 
+def test_update_subreddit_metadata():
+    """Test triggering a background metadata refresh and polling its status"""
+    print("\nTesting update-subreddit-metadata endpoint...")
+    
+    try:
+        response = requests.post(f"{BASE_URL}/update-subreddit-metadata")
+        if response.status_code != 200:
+            print(f"❌ Error: {response.status_code} - {response.text}")
+            return False
+        print(f"Refresh {response.json()['status']}")
+        
+        for _ in range(60):
+            status = requests.get(f"{BASE_URL}/subreddit-metadata-status").json()
+            if not status['running']:
+                break
+            print(f"  - {status['refreshed']} refreshed, {status['remaining']} remaining")
+            time.sleep(2)
+        
+        print("✅ Success!")
+        print(f"Refreshed {status['refreshed']} of {status['stale']} stale subreddits ({status['failed']} failed)")
+        return True
+    except Exception as e:
+        print(f"❌ Exception: {e}")
+        return False
+
 if __name__ == "__main__":
     print("🧪 Testing Subreddit Endpoints\n")
     
@@ -84,13 +110,15 @@ if __name__ == "__main__":
     test1 = test_get_relevant_subreddits()
     test2 = test_get_all_subreddits()
     test3 = test_search_reddit_targeted()
+    test4 = test_update_subreddit_metadata()
     
     print(f"\n📊 Test Results:")
     print(f"  - Relevant subreddits: {'✅' if test1 else '❌'}")
     print(f"  - All subreddits: {'✅' if test2 else '❌'}")
     print(f"  - Targeted search: {'✅' if test3 else '❌'}")
+    print(f"  - Metadata refresh: {'✅' if test4 else '❌'}")
     
-    if all([test1, test2, test3]):
+    if all([test1, test2, test3, test4]):
         print("\n🎉 All tests passed! The subreddit system is working correctly.")
     else:
         print("\n⚠️  Some tests failed. Please check the backend configuration.") 
\ No newline at end of file
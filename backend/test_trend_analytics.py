@@ -0,0 +1,52 @@
+import numpy as np
+
+from trend_analytics import analyze, summarize
+
+# Behavior checks for the vectorized trend analytics
+
+def test_trend_verdicts():
+    """Rising, flat and falling series get Growing, Stable and Declining"""
+    print("Testing trend verdicts...")
+    rising = list(range(10, 62))
+    flat = [40] * 52
+    falling = rising[::-1]
+    assert [stats["trend"] for stats in summarize([rising, flat, falling])] == ["Growing", "Stable", "Declining"]
+    print("✅ Success!")
+
+def test_seasonality():
+    """A series repeating every 13 points is seasonal at that lag"""
+    print("Testing seasonality...")
+    seasonal = 50 + 20 * np.sin(np.arange(52) * 2 * np.pi / 13)
+    stats = analyze(np.array([seasonal]))
+    assert stats["seasonality"][0] > 0.6 and stats["seasonalLag"][0] == 13, stats
+    print("✅ Success!")
+
+def test_unequal_lengths():
+    """Series of 52 and 53 weekly points are each analyzed over all of their points"""
+    print("Testing series of unequal length...")
+    short = list(range(52))
+    long = [100] + list(range(52))  # the extra leading point only exists in the longer series
+    batch = summarize([short, long])
+    assert batch[0] == summarize([short])[0]
+    assert batch[1] == summarize([long])[0]
+    assert batch[0] != batch[1]
+    assert summarize([]) == []
+    print("✅ Success!")
+
+if __name__ == "__main__":
+    print("🧪 Testing Trend Analytics\n")
+
+    results = {}
+    for name, test in [("Trend verdicts", test_trend_verdicts),
+                       ("Seasonality", test_seasonality),
+                       ("Unequal lengths", test_unequal_lengths)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} failed: {e}")
+            results[name] = False
+
+    print(f"\n📊 Test Results:")
+    for name, passed in results.items():
+        print(f"  - {name}: {'✅' if passed else '❌'}")
@@ -0,0 +1,72 @@
+import asyncio
+import contextvars
+import time
+
+from workers import WorkerPool
+
+# Behavior checks for bounded Trends lookups: pool timeouts and client disconnects (no Trends calls)
+
+request_id: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="")
+
+class FakeRequest:
+    """Request that reports a disconnect after a number of polls"""
+
+    def __init__(self, polls_before_disconnect):
+        self.polls = polls_before_disconnect
+
+    async def is_disconnected(self):
+        self.polls -= 1
+        return self.polls < 0
+
+def test_pool_timeout_and_context():
+    """A slow call times out on the pool; context variables reach the worker thread"""
+    print("Testing worker pool timeout...")
+    pool = WorkerPool("test-trends", 1)
+
+    async def run():
+        request_id.set("req-1")
+        assert await pool.run(request_id.get) == "req-1"
+        try:
+            await pool.run(time.sleep, 0.5, timeout=0.05)
+            return False
+        except asyncio.TimeoutError:
+            return True
+
+    assert asyncio.run(run())
+    pool.shutdown()
+    print("✅ Success!")
+
+def test_gives_up_on_disconnect():
+    """until_disconnected returns results, and raises 499 once the client goes away"""
+    print("Testing client disconnect handling...")
+    from fastapi import HTTPException
+    from main import until_disconnected
+
+    async def slow(seconds, value):
+        await asyncio.sleep(seconds)
+        return value
+
+    assert asyncio.run(until_disconnected(FakeRequest(5), slow(0.01, "done"), poll_interval=0.01)) == "done"
+    try:
+        asyncio.run(until_disconnected(FakeRequest(1), slow(5, "late"), poll_interval=0.01))
+        assert False, "disconnect was not detected"
+    except HTTPException as e:
+        assert e.status_code == 499
+    print("✅ Success!")
+
+if __name__ == "__main__":
+    print("🧪 Testing Trends Pool\n")
+
+    results = {}
+    for name, test in [("Pool timeout", test_pool_timeout_and_context),
+                       ("Client disconnect", test_gives_up_on_disconnect)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} failed: {e}")
+            results[name] = False
+
+    print(f"\n📊 Test Results:")
+    for name, passed in results.items():
+        print(f"  - {name}: {'✅' if passed else '❌'}")
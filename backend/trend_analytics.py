@@ -0,0 +1,128 @@
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Weights of the composite demand score components (each scaled to 0-1)
+DEFAULT_WEIGHTS = {
+    "level": 0.35,        # average interest relative to the series peak
+    "momentum": 0.35,     # fitted change over the window
+    "stability": 0.2,     # low volatility around the trend line
+    "consistency": 0.1,   # year-round rather than seasonal demand
+}
+
+# Fitted change over the window (relative to the mean) that counts as growing/declining
+TREND_THRESHOLD = 0.1
+
+_EPS = 1e-9
+
+
+def _autocorrelation(residuals: np.ndarray, max_lag: int) -> np.ndarray:
+    """Autocorrelation of each row at lags 2..max_lag, shape (rows, max_lag - 1)"""
+    centered = residuals - residuals.mean(axis=1, keepdims=True)
+    variance = (centered ** 2).sum(axis=1)
+    lags = range(2, max_lag + 1)
+    acf = np.stack([(centered[:, lag:] * centered[:, :-lag]).sum(axis=1) for lag in lags], axis=1)
+    return acf / np.maximum(variance, _EPS)[:, None]
+
+
+def analyze(values: np.ndarray, weights: Optional[Dict[str, float]] = None) -> Dict[str, np.ndarray]:
+    """Trend statistics for every row of a (niches, time points) array.
+
+    Returns one array per statistic, each with one entry per row:
+      slope        least-squares change per time step
+      growthRate   mean of the last quarter vs the first quarter, as a fraction
+      volatility   std of residuals around the linear fit, relative to the mean
+      seasonality  strongest autocorrelation (lag >= 2) of the detrended series, 0-1
+      seasonalLag  lag of that autocorrelation in time steps (0 when too short)
+      fittedChange fitted change over the whole window, relative to the mean
+      score        composite demand score, 0-100
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    rows, points = values.shape
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    mean = values.mean(axis=1)
+    scale = np.maximum(mean, _EPS)
+
+    # Least squares fit against centered time, vectorized over rows
+    t = np.arange(points, dtype=float)
+    t_centered = t - t.mean()
+    denominator = max((t_centered ** 2).sum(), _EPS)
+    slope = (values - mean[:, None]) @ t_centered / denominator
+    fitted = mean[:, None] + slope[:, None] * t_centered
+    residuals = values - fitted
+
+    window = max(1, points // 4)
+    first = values[:, :window].mean(axis=1)
+    last = values[:, -window:].mean(axis=1)
+    growth_rate = (last - first) / np.maximum(first, 1.0)
+
+    volatility = residuals.std(axis=1) / scale
+
+    max_lag = points // 2
+    if max_lag >= 2:
+        acf = _autocorrelation(residuals, max_lag)
+        seasonal_index = acf.argmax(axis=1)
+        seasonality = np.clip(acf[np.arange(rows), seasonal_index], 0.0, 1.0)
+        # A (near) perfect linear fit leaves only rounding noise in the residuals
+        seasonality[residuals.std(axis=1) < 1e-6 * scale] = 0.0
+        seasonal_lag = np.where(seasonality > 0, seasonal_index + 2, 0)
+    else:
+        seasonality = np.zeros(rows)
+        seasonal_lag = np.zeros(rows, dtype=int)
+
+    # Relative change over the whole window according to the fit
+    fitted_change = slope * max(points - 1, 1) / scale
+    peak = np.maximum(values.max(axis=1), _EPS)
+    components = {
+        "level": np.clip(mean / peak, 0.0, 1.0),
+        "momentum": 0.5 + 0.5 * np.tanh(2 * fitted_change),
+        "stability": 1.0 - np.clip(volatility, 0.0, 1.0),
+        "consistency": 1.0 - seasonality,
+    }
+    total_weight = sum(weights.get(name, 0) for name in components) or 1.0
+    score = 100 * sum(weights.get(name, 0) * component for name, component in components.items()) / total_weight
+
+    return {
+        "slope": slope,
+        "growthRate": growth_rate,
+        "volatility": volatility,
+        "seasonality": seasonality,
+        "seasonalLag": seasonal_lag,
+        "fittedChange": fitted_change,
+        "score": score,
+    }
+
+
+def trend_labels(fitted_change: np.ndarray, threshold: float = TREND_THRESHOLD) -> List[str]:
+    """Growing/Stable/Declining verdict per row from the fitted relative change"""
+    return ["Growing" if change > threshold else "Declining" if change < -threshold else "Stable"
+            for change in fitted_change]
+
+
+def summarize(series: Sequence[Sequence[float]], weights: Optional[Dict[str, float]] = None) -> List[Dict]:
+    """Analyze a batch of series and return one JSON-friendly dict per series.
+
+    Series are analyzed over all of their points, so the statistics line up
+    with the labels returned next to them. Series of equal length (the usual
+    case) are analyzed together in one array; weekly data can differ by a
+    point, so each length is its own group.
+    """
+    by_length: Dict[int, List[int]] = {}
+    for i, values in enumerate(series):
+        by_length.setdefault(len(values), []).append(i)
+
+    results: List[Dict] = [{} for _ in series]
+    for rows in by_length.values():
+        stats = analyze(np.array([series[i] for i in rows], dtype=float), weights)
+        labels = trend_labels(stats["fittedChange"])
+        for j, i in enumerate(rows):
+            results[i] = {
+                "trend": labels[j],
+                "slope": round(float(stats["slope"][j]), 3),
+                "growthRate": round(float(stats["growthRate"][j]), 3),
+                "volatility": round(float(stats["volatility"][j]), 3),
+                "seasonality": round(float(stats["seasonality"][j]), 3),
+                "seasonalLag": int(stats["seasonalLag"][j]),
+                "score": round(float(stats["score"][j]), 1),
+            }
+    return results
@@ -0,0 +1,216 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from cache import TTLCache, make_cache_key
+
+# Google Trends compares at most five keywords per payload
+MAX_KEYWORDS_PER_PAYLOAD = 5
+
+# Batched keywords whose peak within the batch is below this are too coarse to
+# rescale (a peak of 2 leaves only 0/1/2) and are queried on their own instead
+MIN_BATCH_PEAK = 20
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    response = getattr(error, "response", None)
+    return type(error).__name__ == "TooManyRequestsError" or getattr(response, "status_code", None) == 429
+
+
+class TrendsService:
+    """Interest-over-time lookups through pooled Trends sessions and a persistent cache.
+
+    Single keywords are cached per (keyword, timeframe). Several keywords are
+    fetched together, up to five per payload, and cached per (batch,
+    timeframe), since batched values are relative to the batch's top keyword
+    and only approximate a single-keyword query. Keywords that are too weak
+    within their batch are queried and cached on their own. Entries younger
+    than `refresh_after` seconds are served without calling Google; older
+    ones are refetched, but kept in the cache (for the cache TTL) and served
+    as stale if the refetch fails. After a 429 no requests are made for
+    `cooldown` seconds.
+    """
+
+    def __init__(self, session_factory: Callable, cache: TTLCache, sessions: int = 2,
+                 refresh_after: float = 43200, cooldown: float = 300):
+        self.session_factory = session_factory
+        self.cache = cache
+        self.refresh_after = refresh_after
+        self.cooldown = cooldown
+        self._sessions: "queue.LifoQueue" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max(1, sessions))
+        self._lock = threading.Lock()
+        self._cooldown_until = 0.0
+        self.sessions_created = 0
+        self.fetches = 0
+        self.errors = 0
+        self.stale_served = 0
+        self.last_error: Optional[str] = None
+
+    @contextmanager
+    def _session(self):
+        """Borrow a pooled Trends session; sessions that raise are discarded"""
+        with self._slots:
+            try:
+                session = self._sessions.get_nowait()
+            except queue.Empty:
+                session = self.session_factory()
+                with self._lock:
+                    self.sessions_created += 1
+            yield session
+            self._sessions.put(session)
+
+    def _fetch(self, keywords: List[str], timeframe: str) -> Dict[str, Dict]:
+        """Fetch up to five keywords in one payload, each series scaled to its own peak.
+
+        Each series also carries "batchPeak", its peak within the payload.
+        """
+        remaining = self._cooldown_until - time.time()
+        if remaining > 0:
+            raise RuntimeError(f"Google Trends rate limited, retrying in {remaining:.0f}s")
+        try:
+            with self._session() as session:
+                session.build_payload(keywords, timeframe=timeframe)
+                data = session.interest_over_time()
+        except Exception as e:
+            if _is_rate_limited(e):
+                self._cooldown_until = time.time() + self.cooldown
+            raise
+        finally:
+            with self._lock:
+                self.fetches += 1
+
+        series = {}
+        if data.empty:
+            return series
+        labels = data.index.strftime('%b %Y').tolist()
+        fetched_at = time.time()
+        for keyword in keywords:
+            if keyword not in data.columns:
+                continue
+            values = data[keyword].tolist()
+            peak = max(values) if values else 0
+            if not peak:
+                continue
+            # Batched columns are integers relative to the batch's top keyword;
+            # rescaling to the series' own peak only approximates a
+            # single-keyword query, and the lower the peak the coarser it gets
+            search_volume = [round(value * 100 / peak) for value in values] if peak != 100 else values
+            series[keyword] = {"labels": labels, "searchVolume": search_volume, "fetchedAt": fetched_at,
+                               "batchPeak": peak}
+        return series
+
+    def _lookup(self, key: str):
+        """(fresh entry, expired entry) for a cache key; at most one is set"""
+        entry = self.cache.get(key)
+        if entry is not None and time.time() - entry["fetchedAt"] < self.refresh_after:
+            return entry, None
+        return None, entry
+
+    def _record_error(self, keywords: List[str], error: Exception):
+        print(f"Google Trends error for {keywords}: {error}")
+        with self._lock:
+            self.errors += 1
+            self.last_error = str(error)
+
+    def _stale(self, entry: Optional[Dict]) -> Optional[Dict]:
+        if entry is None:
+            return None
+        with self._lock:
+            self.stale_served += 1
+        return {**entry, "stale": True}
+
+    def _get_single(self, keyword: str, timeframe: str, fetch: bool = True) -> Optional[Dict]:
+        """Series for one keyword queried on its own, from the cache or Google"""
+        key = make_cache_key("trends", keyword.lower(), timeframe)
+        entry, expired = self._lookup(key)
+        if entry is not None:
+            return {**entry, "stale": False}
+        fetched = None
+        if fetch:
+            try:
+                fetched = self._fetch([keyword], timeframe).get(keyword)
+            except Exception as e:
+                self._record_error([keyword], e)
+        if fetched is None:
+            return self._stale(expired)
+        fetched.pop("batchPeak", None)
+        self.cache.set(key, fetched)
+        return {**fetched, "stale": False}
+
+    def _get_batch(self, batch: List[str], timeframe: str) -> Dict[str, Dict]:
+        """Series for up to five keywords fetched in one payload.
+
+        Keywords missing from the batch or with a batch peak below
+        MIN_BATCH_PEAK are queried on their own.
+        """
+        key = make_cache_key("trends-batch", sorted(keyword.lower() for keyword in batch), timeframe)
+        entry, expired = self._lookup(key)
+        stale = False
+        fetch_singles = True
+        if entry is None:
+            fetched = None
+            try:
+                fetched = self._fetch(batch, timeframe)
+            except Exception as e:
+                self._record_error(batch, e)
+            if fetched is not None:
+                entry = {
+                    "fetchedAt": time.time(),
+                    "series": {
+                        keyword.lower(): {name: value for name, value in series.items() if name != "batchPeak"}
+                        for keyword, series in fetched.items() if series["batchPeak"] >= MIN_BATCH_PEAK
+                    },
+                }
+                self.cache.set(key, entry)
+            elif expired is not None:
+                with self._lock:
+                    self.stale_served += 1
+                entry, stale = expired, True
+            else:
+                # Google is failing; only cached single-keyword series can help
+                entry, fetch_singles = {"series": {}}, False
+
+        results: Dict[str, Dict] = {}
+        for keyword in batch:
+            series = entry["series"].get(keyword.lower())
+            if series is None:
+                series = self._get_single(keyword, timeframe, fetch=fetch_singles)
+                if series is not None:
+                    results[keyword] = series
+            else:
+                results[keyword] = {**series, "stale": stale}
+        return results
+
+    def get_interest(self, keywords: List[str], timeframe: str = 'today 12-m') -> Dict[str, Dict]:
+        """Interest-over-time series per keyword; keywords without data are left out.
+
+        Each series has "labels", "searchVolume", "fetchedAt" and "stale"
+        (True when a failed refresh fell back to an expired entry).
+        """
+        keywords = list(dict.fromkeys(keyword.strip() for keyword in keywords if keyword.strip()))
+        results: Dict[str, Dict] = {}
+        for start in range(0, len(keywords), MAX_KEYWORDS_PER_PAYLOAD):
+            batch = keywords[start:start + MAX_KEYWORDS_PER_PAYLOAD]
+            if len(batch) == 1:
+                series = self._get_single(batch[0], timeframe)
+                if series is not None:
+                    results[batch[0]] = series
+            else:
+                results.update(self._get_batch(batch, timeframe))
+        return results
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "sessionsCreated": self.sessions_created,
+                "sessionsIdle": self._sessions.qsize(),
+                "fetches": self.fetches,
+                "errors": self.errors,
+                "staleServed": self.stale_served,
+                "cooldownRemaining": max(0, round(self._cooldown_until - time.time())),
+                "lastError": self.last_error,
+                "cache": self.cache.stats(),
+            }
@@ -0,0 +1,61 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+
+class WorkerPool:
+    """Bounded thread pool that runs blocking client calls off the event loop"""
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{name}-worker")
+        self._lock = threading.Lock()
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) on the pool and await its result.
+
+        The caller's context variables are carried into the worker thread. If
+        timeout expires before the call is picked up by a worker it is dropped
+        from the queue; a call that already started runs to completion in the
+        background but its result is discarded.
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        future = loop.run_in_executor(self._executor, partial(context.run, self._call, fn, args, kwargs))
+        if timeout is not None:
+            return await asyncio.wait_for(future, timeout)
+        return await future
+
+    def _call(self, fn: Callable, args: tuple, kwargs: Dict) -> Any:
+        with self._lock:
+            self.active += 1
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self.active -= 1
+                self.failed += 1
+            raise
+        with self._lock:
+            self.active -= 1
+            self.completed += 1
+        return result
+
+    def stats(self) -> Dict:
+        return {
+            "name": self.name,
+            "maxWorkers": self.max_workers,
+            "active": self.active,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,4 +1,5 @@
 import React, { useState, useEffect } from 'react';
+import axios from 'axios';
 import { Sparkles, Settings, Key, Shield, User, Save, Loader2, Trash2, Plus } from 'lucide-react';
 
 const APIConfig = ({ onConfigSuccess }) => {
@@ -46,6 +47,11 @@ const APIConfig = ({ onConfigSuccess }) => {
 
       const data = await response.json();
 
+      // Send the client key with every API call so this browser keeps its own credentials
+      if (data.clientKey) {
+        axios.defaults.headers.common['X-Client-Key'] = data.clientKey;
+      }
+
       // If profile name is provided, save the profile
       if (profileName.trim()) {
         const newProfile = {